@@ -25,8 +25,9 @@ config = load_config()
 # 데이터베이스 초기화
 init_database()
 
-# 사용자 정의 CSS
-st.markdown("""
+# 사용자 정의 CSS/헤더 (모듈 상수 — rerun마다 문자열을 다시 만들지 않음.
+# Streamlit은 매 run마다 DOM을 다시 그리므로 st.markdown 호출 자체는 생략할 수 없다)
+_CUSTOM_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
@@ -50,7 +51,22 @@ st.markdown("""
         border-left: 4px solid #667eea;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_MAIN_HEADER_HTML = """
+<div class="main-header">
+    <h1>🎓 학원 종합 관리 시스템</h1>
+    <p>효율적인 학원 운영을 위한 통합 솔루션</p>
+</div>
+"""
+
+_SIDEBAR_MENU_HTML = """
+<div class="sidebar-content">
+    <h3>📋 메뉴</h3>
+</div>
+"""
+
+st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
 
 def main():
     # 인증 확인
@@ -59,20 +75,11 @@ def main():
         return
     
     # 메인 헤더
-    st.markdown("""
-    <div class="main-header">
-        <h1>🎓 학원 종합 관리 시스템</h1>
-        <p>효율적인 학원 운영을 위한 통합 솔루션</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
+    st.markdown(_MAIN_HEADER_HTML, unsafe_allow_html=True)
+
     # 사이드바 메뉴
     with st.sidebar:
-        st.markdown("""
-        <div class="sidebar-content">
-            <h3>📋 메뉴</h3>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_MENU_HTML, unsafe_allow_html=True)
         
         # 사용자 정보
         if 'user' in st.session_state:
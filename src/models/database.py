@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Date, Enum
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Date, Enum, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import relationship
@@ -67,7 +67,8 @@ class Student(Base):
     
     id = Column(Integer, primary_key=True)
     academy_id = Column(String(20), unique=True, nullable=False)
-    name = Column(String(100), nullable=False)
+    # 목록이 항상 이름순이므로 인덱스로 정렬 단계 제거
+    name = Column(String(100), nullable=False, index=True)
     gender = Column(Enum(Gender), nullable=False)
     birth_date = Column(Date, nullable=False)
     phone = Column(String(20))
@@ -85,8 +86,8 @@ class Student(Base):
     class_name = Column(String(20))
     
     # 학원 정보
-    enrollment_date = Column(Date, default=datetime.utcnow().date())
-    status = Column(Enum(StudentStatus), default=StudentStatus.ACTIVE)
+    enrollment_date = Column(Date, default=lambda: datetime.utcnow().date(), index=True)
+    status = Column(Enum(StudentStatus), default=StudentStatus.ACTIVE, index=True)
     
     # 프로필 이미지
     profile_image_path = Column(String(500))
@@ -108,7 +109,10 @@ class Student(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 관계
-    guardians = relationship("Guardian", secondary="student_guardians", back_populates="students")
+    # 보호자 조회는 서비스 계층에서 StudentGuardian 조인으로 처리하므로
+    # 우발적인 lazy load(N+1)는 개발 중에 바로 드러나도록 막아둔다.
+    # 필요한 곳에서는 .options(selectinload(Student.guardians))로 명시적으로 로딩할 것.
+    guardians = relationship("Guardian", secondary="student_guardians", back_populates="students", lazy="raise")
     enrollments = relationship("Enrollment", back_populates="student")
 
 # 보호자 모델
@@ -116,9 +120,15 @@ class Guardian(Base):
     __tablename__ = 'guardians'
     
     id = Column(Integer, primary_key=True)
-    name = Column(String(100), nullable=False)
+    # 목록이 항상 이름순이므로 인덱스로 정렬 단계 제거
+    name = Column(String(100), nullable=False, index=True)
     relationship_type = Column(Enum(RelationshipType), nullable=False)
     phone = Column(String(20), nullable=False)
+    # 검색용 정규화 전화번호 (숫자만) — LIKE '%…%' 풀스캔 대신 인덱스 동등 조회용
+    phone_normalized = Column(String(20), index=True)
+    # 검색용 소문자 블롭 (이름/전화/이메일/직장 연결) — 컬럼 4개에 각각
+    # ilike를 거는 대신 한 컬럼에 LIKE 한 번으로 검색
+    search_blob = Column(Text)
     email = Column(String(100))
     
     # 주소
@@ -152,7 +162,7 @@ class Guardian(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 관계
-    students = relationship("Student", secondary="student_guardians", back_populates="guardians")
+    students = relationship("Student", secondary="student_guardians", back_populates="guardians", lazy="raise")
 
 # 학생-보호자 관계 테이블
 class StudentGuardian(Base):
@@ -180,7 +190,7 @@ class Course(Base):
     
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
-    subject_id = Column(Integer, ForeignKey('subjects.id'), nullable=False)
+    subject_id = Column(Integer, ForeignKey('subjects.id'), nullable=False, index=True)
     teacher_id = Column(Integer, ForeignKey('users.id'))
     
     # 수업 정보
@@ -197,14 +207,13 @@ class Course(Base):
     
     start_date = Column(Date)
     end_date = Column(Date)
-    status = Column(Enum(CourseStatus), default=CourseStatus.ACTIVE)
+    status = Column(Enum(CourseStatus), default=CourseStatus.ACTIVE, index=True)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # 관계
+    # 관계 (teacher 관계는 사용처가 없어 제거 — teacher_id FK만 유지)
     subject = relationship("Subject", back_populates="courses")
-    teacher = relationship("User")
     enrollments = relationship("Enrollment", back_populates="course")
 
 # 수강 등록 모델
@@ -212,10 +221,10 @@ class Enrollment(Base):
     __tablename__ = 'enrollments'
     
     id = Column(Integer, primary_key=True)
-    student_id = Column(Integer, ForeignKey('students.id'), nullable=False)
-    course_id = Column(Integer, ForeignKey('courses.id'), nullable=False)
+    student_id = Column(Integer, ForeignKey('students.id'), nullable=False, index=True)
+    course_id = Column(Integer, ForeignKey('courses.id'), nullable=False, index=True)
     
-    enrollment_date = Column(Date, default=datetime.utcnow().date())
+    enrollment_date = Column(Date, default=lambda: datetime.utcnow().date())
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
     
@@ -232,3 +241,17 @@ class Enrollment(Base):
     student = relationship("Student", back_populates="enrollments")
     course = relationship("Course", back_populates="enrollments")
 
+    # 동일 학생의 동일 과목 중복 수강 방지 (ACTIVE 행에만 적용되는 부분 유니크 인덱스)
+    # + 수강생 수/수강 목록 조회가 모두 (course_id|student_id, status)로
+    # 필터링하므로 복합 인덱스로 테이블 스캔을 피한다
+    __table_args__ = (
+        Index(
+            'uq_enrollments_active_student_course',
+            'student_id', 'course_id',
+            unique=True,
+            sqlite_where=text("status = 'ACTIVE'")
+        ),
+        Index('ix_enrollments_course_status', 'course_id', 'status'),
+        Index('ix_enrollments_student_status', 'student_id', 'status'),
+    )
+
@@ -1,61 +1,112 @@
 import streamlit as st
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 from src.services.database import get_db_session
 from src.services.course_service import CourseService
-from src.services.student_service import StudentService
 from src.models.database import CourseStatus, EnrollmentStatus, Subject, Course
 import json
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_subjects(version: int):
+    """드롭다운/폼에서 쓰는 (id, 과목명) 목록 캐시 (ORM 객체는 캐시 불가)
+
+    version은 과목 생성 시 증가하는 무효화 토큰 — 캐시 키가 바뀌면서
+    전역 clear 없이 해당 세션만 새로 조회한다.
+    """
+    db = get_db_session()
+    try:
+        return [(s.id, s.name) for s in CourseService(db).get_subjects()]
+    finally:
+        db.close()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _stats_snapshot():
+    """통계 탭용 집계 스냅샷 캐시 (무거운 GROUP BY를 rerun마다 재실행하지 않음)
+
+    캐시 미스 시에도 두 집계를 각자 세션으로 병렬 실행해
+    총 대기시간을 개별 쿼리의 합이 아닌 최댓값 수준으로 줄인다.
+    """
+    def _stats():
+        db = get_db_session()
+        try:
+            return CourseService(db).get_course_statistics()
+        finally:
+            db.close()
+
+    def _popular():
+        db = get_db_session()
+        try:
+            return CourseService(db).get_popular_courses(5)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        stats_future = pool.submit(_stats)
+        popular_future = pool.submit(_popular)
+        return {
+            'stats': stats_future.result(),
+            'popular': popular_future.result()
+        }
+
+def _subjects_version() -> int:
+    """현재 세션의 과목 캐시 버전"""
+    return st.session_state.setdefault('_subjects_v', 0)
+
+def _bump_subjects_version():
+    """과목 변경 후 캐시 무효화"""
+    st.session_state['_subjects_v'] = st.session_state.get('_subjects_v', 0) + 1
+
+
 def render():
     """수강과목 관리 페이지 렌더링"""
     st.title("📚 수강과목 관리")
-    
-    # 탭 생성
+
+    # 탭 생성 (각 탭은 fragment로 격리되어 해당 탭만 재실행됨)
     tab1, tab2, tab3, tab4 = st.tabs([
-        "📋 과목 관리", 
-        "🎯 수강과목 관리", 
-        "👥 수강생 배정", 
+        "📋 과목 관리",
+        "🎯 수강과목 관리",
+        "👥 수강생 배정",
         "📊 통계"
     ])
-    
+
+    with tab1:
+        render_subject_management()
+
+    with tab2:
+        render_course_management()
+
+    with tab3:
+        render_enrollment_management()
+
+    with tab4:
+        render_course_statistics()
+
+@st.fragment
+def render_subject_management():
+    """과목 관리"""
+    st.subheader("📋 과목 관리")
+
     db = get_db_session()
-    
     try:
         course_service = CourseService(db)
-        student_service = StudentService(db)
-        
-        with tab1:
-            render_subject_management(course_service)
-        
-        with tab2:
-            render_course_management(course_service)
-        
-        with tab3:
-            render_enrollment_management(course_service, student_service)
-        
-        with tab4:
-            render_course_statistics(course_service)
-            
+        _render_subject_management(course_service)
     except Exception as e:
-        st.error(f"페이지 로딩 중 오류 발생: {str(e)}")
+        st.error(f"과목 관리 로딩 중 오류 발생: {str(e)}")
     finally:
         db.close()
 
-def render_subject_management(course_service):
-    """과목 관리"""
-    st.subheader("📋 과목 관리")
-    
+def _render_subject_management(course_service):
+
     col1, col2 = st.columns([2, 1])
     
     with col1:
         # 과목 목록
-        subjects = course_service.get_subjects()
-        
+        subjects = course_service.get_subjects_with_course_counts()
+
         if subjects:
             subject_data = []
-            for subject in subjects:
-                course_count = len(subject.courses) if subject.courses else 0
+            for subject, course_count in subjects:
                 subject_data.append({
                     "ID": subject.id,
                     "과목명": subject.name,
@@ -89,15 +140,28 @@ def render_subject_management(course_service):
                         }
                         
                         course_service.create_subject(subject_data)
+                        _bump_subjects_version()
                         st.success(f"'{subject_name}' 과목이 등록되었습니다!")
                         st.rerun()
                     except Exception as e:
                         st.error(f"과목 등록 실패: {str(e)}")
 
-def render_course_management(course_service):
+@st.fragment
+def render_course_management():
     """수강과목 관리"""
     st.subheader("🎯 수강과목 관리")
-    
+
+    db = get_db_session()
+    try:
+        course_service = CourseService(db)
+        _render_course_management(course_service)
+    except Exception as e:
+        st.error(f"수강과목 관리 로딩 중 오류 발생: {str(e)}")
+    finally:
+        db.close()
+
+def _render_course_management(course_service):
+
     # 검색 및 필터
     col1, col2, col3 = st.columns([2, 1, 1])
     
@@ -105,8 +169,9 @@ def render_course_management(course_service):
         search_term = st.text_input("🔍 검색", placeholder="수강과목명, 과목명, 레벨")
     
     with col2:
-        subjects = course_service.get_subjects()
-        subject_options = ["전체"] + [s.name for s in subjects]
+        subjects = _cached_subjects(_subjects_version())
+        subject_name_to_id = {name: sid for sid, name in subjects}
+        subject_options = ["전체"] + list(subject_name_to_id)
         selected_subject = st.selectbox("과목 필터", subject_options)
     
     with col3:
@@ -116,39 +181,42 @@ def render_course_management(course_service):
     # 수강과목 목록 조회
     subject_id = None
     if selected_subject != "전체":
-        subject_obj = next((s for s in subjects if s.name == selected_subject), None)
-        subject_id = subject_obj.id if subject_obj else None
+        subject_id = subject_name_to_id.get(selected_subject)
     
     status = None if selected_status == "전체" else selected_status
     
-    courses = course_service.get_courses(
+    courses = course_service.list_courses_for_table(
         subject_id=subject_id,
         status=status,
         search_term=search_term if search_term else None
     )
-    
+
     # 수강과목 목록 표시
     if courses:
-        course_data = []
-        for course in courses:
-            enrollment_count = course_service.count_enrollments(course.id)
-            
-            course_data.append({
-                "선택": False,
-                "ID": course.id,
-                "수강과목명": course.name,
-                "과목": course.subject.name if course.subject else "",
-                "레벨": course.level or "",
-                "정원": course.capacity,
-                "현재인원": enrollment_count,
-                "여유인원": course.capacity - enrollment_count,
-                "시간": course.schedule_info or "",
-                "상태": course.status.value,
-                "시작일": course.start_date.strftime("%Y-%m-%d") if course.start_date else "",
-                "종료일": course.end_date.strftime("%Y-%m-%d") if course.end_date else ""
-            })
-        
-        df = pd.DataFrame(course_data)
+        # dict 리스트 대신 튜플 + from_records로 DataFrame을 바로 구성
+        course_records = [
+            (
+                False,
+                row.id,
+                row.name,
+                row.subject_name or "",
+                row.level or "",
+                row.capacity,
+                row.enrollment_count,
+                row.capacity - row.enrollment_count,
+                row.schedule_info or "",
+                row.status.value,
+                row.start_date.strftime("%Y-%m-%d") if row.start_date else "",
+                row.end_date.strftime("%Y-%m-%d") if row.end_date else ""
+            )
+            for row in courses
+        ]
+
+        df = pd.DataFrame.from_records(
+            course_records,
+            columns=["선택", "ID", "수강과목명", "과목", "레벨", "정원",
+                     "현재인원", "여유인원", "시간", "상태", "시작일", "종료일"]
+        )
         
         edited_df = st.data_editor(
             df.drop(columns=["ID"]),
@@ -168,8 +236,10 @@ def render_course_management(course_service):
             
             for idx in selected_indices:
                 if idx < len(courses):
-                    course = courses[idx]
-                    render_course_detail(course, course_service)
+                    row = courses[idx]
+                    course = course_service.get_course(row.id)
+                    if course:
+                        render_course_detail(course, course_service, {row.id: row.enrollment_count})
     
     else:
         st.info("등록된 수강과목이 없습니다.")
@@ -182,13 +252,11 @@ def render_course_management(course_service):
         col1, col2 = st.columns(2)
         
         with col1:
-            subjects = course_service.get_subjects()
-            if not subjects:
+            subject_options = _cached_subjects(_subjects_version())
+            if not subject_options:
                 st.warning("먼저 과목을 등록해주세요.")
                 st.form_submit_button("등록", disabled=True)
                 return
-            
-            subject_options = [(s.id, s.name) for s in subjects]
             selected_subject_idx = st.selectbox(
                 "과목*", 
                 range(len(subject_options)),
@@ -234,12 +302,13 @@ def render_course_management(course_service):
                     }
                     
                     course = course_service.create_course(course_data)
+                    _stats_snapshot.clear()
                     st.success(f"'{course_name}' 수강과목이 등록되었습니다!")
                     st.rerun()
                 except Exception as e:
                     st.error(f"수강과목 등록 실패: {str(e)}")
 
-def render_course_detail(course, course_service):
+def render_course_detail(course, course_service, enrollment_counts=None):
     """수강과목 상세 정보"""
     st.write(f"### 📚 {course.name}")
     
@@ -255,7 +324,10 @@ def render_course_detail(course, course_service):
     
     with col2:
         st.write("**진행 정보**")
-        enrollment_count = course_service.count_enrollments(course.id)
+        if enrollment_counts is not None:
+            enrollment_count = enrollment_counts.get(course.id, 0)
+        else:
+            enrollment_count = course_service.count_enrollments(course.id)
         st.write(f"• 현재 수강생: {enrollment_count}명")
         st.write(f"• 여유 정원: {course.capacity - enrollment_count}명")
         st.write(f"• 상태: {course.status.value}")
@@ -276,10 +348,22 @@ def render_course_detail(course, course_service):
         student_names = [enrollment.student.name for enrollment in enrollments if enrollment.student]
         st.write(", ".join(student_names))
 
-def render_enrollment_management(course_service, student_service):
+@st.fragment
+def render_enrollment_management():
     """수강생 배정 관리"""
     st.subheader("👥 수강생 배정 관리")
-    
+
+    db = get_db_session()
+    try:
+        course_service = CourseService(db)
+        _render_enrollment_management(course_service)
+    except Exception as e:
+        st.error(f"수강생 배정 로딩 중 오류 발생: {str(e)}")
+    finally:
+        db.close()
+
+def _render_enrollment_management(course_service):
+
     # 수강과목 선택
     courses = course_service.get_courses(status="진행중")
     if not courses:
@@ -301,51 +385,85 @@ def render_enrollment_management(course_service, student_service):
         
         with col1:
             st.write("**현재 수강생**")
-            enrollments = course_service.get_course_enrollments(course_id)
-            
+            enrollments = course_service.list_course_enrollments(course_id)
+
             if enrollments:
-                for enrollment in enrollments:
-                    col_student, col_action = st.columns([3, 1])
-                    with col_student:
-                        st.write(f"• {enrollment.student.name} ({enrollment.student.academy_id})")
-                    with col_action:
-                        if st.button("❌", key=f"drop_{enrollment.id}"):
-                            try:
-                                course_service.unenroll(enrollment.id)
-                                st.success(f"{enrollment.student.name} 학생이 수강 취소되었습니다.")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"수강 취소 실패: {str(e)}")
+                # 행마다 버튼 위젯을 만드는 대신 체크박스 컬럼 + 일괄 적용 버튼 하나
+                df_current = pd.DataFrame.from_records(
+                    [(False, row.student_name, row.academy_id) for row in enrollments],
+                    columns=["취소", "이름", "학원번호"]
+                )
+
+                edited_current = st.data_editor(
+                    df_current,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "취소": st.column_config.CheckboxColumn("취소", default=False)
+                    },
+                    key=f"current_enrollments_{course_id}"
+                )
+
+                drop_indices = edited_current[edited_current["취소"] == True].index.tolist()
+
+                if st.button("❌ 선택 학생 수강 취소", key=f"drop_apply_{course_id}", disabled=not drop_indices):
+                    try:
+                        dropped = course_service.unenroll_many(
+                            [enrollments[idx].enrollment_id for idx in drop_indices]
+                        )
+                        _stats_snapshot.clear()
+                        st.success(f"{dropped}명의 수강이 취소되었습니다.")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"수강 취소 실패: {str(e)}")
             else:
                 st.info("수강중인 학생이 없습니다.")
-        
+
         with col2:
             st.write("**수강 가능한 학생**")
-            available_students = course_service.get_available_students(course_id)
-            
+            available_students = course_service.list_available_students(course_id)
+
             if available_students:
-                for student in available_students:
-                    col_student, col_action = st.columns([3, 1])
-                    with col_student:
-                        st.write(f"• {student.name} ({student.academy_id})")
-                    with col_action:
-                        if st.button("➕", key=f"enroll_{student.id}_{course_id}"):
-                            try:
-                                course_service.enroll(student.id, course_id)
-                                st.success(f"{student.name} 학생이 수강 등록되었습니다.")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"수강 등록 실패: {str(e)}")
+                df_available = pd.DataFrame.from_records(
+                    [(False, row.name, row.academy_id) for row in available_students],
+                    columns=["등록", "이름", "학원번호"]
+                )
+
+                edited_available = st.data_editor(
+                    df_available,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "등록": st.column_config.CheckboxColumn("등록", default=False)
+                    },
+                    key=f"available_students_{course_id}"
+                )
+
+                enroll_indices = edited_available[edited_available["등록"] == True].index.tolist()
+
+                if st.button("➕ 선택 학생 수강 등록", key=f"enroll_apply_{course_id}", disabled=not enroll_indices):
+                    try:
+                        enrolled = course_service.enroll_many(
+                            [available_students[idx].id for idx in enroll_indices],
+                            course_id
+                        )
+                        _stats_snapshot.clear()
+                        st.success(f"{enrolled}명이 수강 등록되었습니다.")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"수강 등록 실패: {str(e)}")
             else:
                 st.info("수강 가능한 학생이 없습니다.")
 
-def render_course_statistics(course_service):
+@st.fragment
+def render_course_statistics():
     """수강과목 통계"""
     st.subheader("📊 수강과목 통계")
-    
+
     try:
-        stats = course_service.get_course_statistics()
-        
+        snapshot = _stats_snapshot()
+        stats = snapshot['stats']
+
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
@@ -362,8 +480,8 @@ def render_course_statistics(course_service):
         
         # 인기 수강과목
         st.subheader("🔥 인기 수강과목 TOP 5")
-        popular_courses = course_service.get_popular_courses(5)
-        
+        popular_courses = snapshot['popular']
+
         if popular_courses:
             popular_data = []
             for i, course in enumerate(popular_courses, 1):
@@ -378,7 +496,7 @@ def render_course_statistics(course_service):
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
             st.info("수강 데이터가 없습니다.")
-            
+
     except Exception as e:
         st.error(f"통계 로딩 실패: {str(e)}")
 
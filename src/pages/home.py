@@ -5,8 +5,8 @@ import pandas as pd
 from src.services.database import get_db_session
 from src.services.student_service import StudentService
 from src.services.guardian_service import GuardianService
-from src.models.database import Student, Guardian, StudentStatus
-from sqlalchemy import func
+from src.models.database import Student, Guardian, RelationshipType
+from sqlalchemy import func, literal, select, union_all
 
 def render():
     """대시보드 페이지 렌더링"""
@@ -42,17 +42,13 @@ def render():
 
 def render_key_metrics(db, student_service, guardian_service):
     """주요 지표 카드"""
-    # 통계 데이터 가져오기
-    students = student_service.get_all()
-    guardians = guardian_service.get_all()
-    
-    total_students = len(students)
-    active_students = len([s for s in students if s.status == StudentStatus.ACTIVE])
-    total_guardians = len(guardians)
-    
-    # 최근 30일 등록 학생
-    recent_students = len([s for s in students if s.enrollment_date and (datetime.now().date() - s.enrollment_date).days <= 30])
-    
+    # 통계 데이터 가져오기 (학생 행을 전부 로딩하지 않고 SQL 집계 사용)
+    counts = student_service.get_dashboard_counts()
+    total_students = counts['total_students']
+    active_students = counts['active_students']
+    recent_students = counts['recent_students']
+    total_guardians = guardian_service.count_all()
+
     # 지표 카드 표시
     col1, col2, col3, col4 = st.columns(4)
     
@@ -89,18 +85,18 @@ def render_student_enrollment_chart(db):
     # 최근 12개월 데이터
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=365)
-    
-    enrollments = db.query(
-        func.strftime('%Y-%m', Student.enrollment_date).label('month'),
-        func.count(Student.id).label('count')
-    ).filter(
+
+    # strftime 그룹핑은 전 행 함수 평가(풀 스캔)를 강제하므로
+    # 인덱스 범위 조회 후 pandas에서 월별로 집계한다
+    rows = db.query(Student.enrollment_date).filter(
         Student.enrollment_date >= start_date
-    ).group_by('month').order_by('month').all()
-    
-    if enrollments:
-        df = pd.DataFrame(enrollments, columns=['월', '신입생 수'])
-        df['월'] = pd.to_datetime(df['월'])
-        
+    ).all()
+
+    if rows:
+        dates = pd.to_datetime([row[0] for row in rows])
+        monthly = pd.Series(1, index=dates).resample('MS').sum()
+        df = pd.DataFrame({'월': monthly.index, '신입생 수': monthly.values})
+
         fig = px.line(df, x='월', y='신입생 수', markers=True,
                      title="월별 신입생 등록 추이")
         fig.update_layout(height=300)
@@ -118,9 +114,8 @@ def render_student_status_chart(db):
     ).group_by(Student.status).all()
     
     if status_count:
-        labels = [status.value for status, _ in status_count]
-        values = [count for _, count in status_count]
-        
+        labels, values = zip(*((status.value, count) for status, count in status_count))
+
         fig = px.pie(values=values, names=labels, title="학생 상태별 분포")
         fig.update_layout(height=300)
         st.plotly_chart(fig, use_container_width=True)
@@ -133,29 +128,45 @@ def render_recent_activities(db):
     """최근 활동"""
     st.subheader("🕒 최근 활동")
     
+    # 최근 학생/보호자 TOP 5를 UNION ALL 한 번의 쿼리로 조회 (필요한 컬럼만)
+    recent_students_q = select(
+        literal('student').label('kind'),
+        Student.name.label('name'),
+        Student.academy_id.label('detail'),
+        Student.created_at.label('created_at')
+    ).order_by(Student.created_at.desc()).limit(5).subquery()
+
+    recent_guardians_q = select(
+        literal('guardian').label('kind'),
+        Guardian.name.label('name'),
+        Guardian.relationship_type.label('detail'),
+        Guardian.created_at.label('created_at')
+    ).order_by(Guardian.created_at.desc()).limit(5).subquery()
+
+    rows = db.execute(
+        union_all(select(recent_students_q), select(recent_guardians_q))
+    ).all()
+
+    recent_students = [row for row in rows if row.kind == 'student']
+    recent_guardians = [row for row in rows if row.kind == 'guardian']
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.write("**📚 최근 등록 학생**")
-        recent_students = db.query(Student).order_by(
-            Student.created_at.desc()
-        ).limit(5).all()
-        
         if recent_students:
-            for student in recent_students:
-                st.write(f"• {student.name} ({student.academy_id}) - {student.created_at.strftime('%m/%d %H:%M')}")
+            for row in recent_students:
+                st.write(f"• {row.name} ({row.detail}) - {row.created_at.strftime('%m/%d %H:%M')}")
         else:
             st.info("등록된 학생이 없습니다.")
-    
+
     with col2:
         st.write("**👨‍👩‍👧‍👦 최근 등록 보호자**")
-        recent_guardians = db.query(Guardian).order_by(
-            Guardian.created_at.desc()
-        ).limit(5).all()
-        
         if recent_guardians:
-            for guardian in recent_guardians:
-                st.write(f"• {guardian.name} ({guardian.relationship_type.value}) - {guardian.created_at.strftime('%m/%d %H:%M')}")
+            for row in recent_guardians:
+                # UNION ALL을 거치면 Enum 컬럼이 저장된 이름 그대로 오므로 여기서 변환
+                relationship = RelationshipType[row.detail].value if row.detail in RelationshipType.__members__ else row.detail
+                st.write(f"• {row.name} ({relationship}) - {row.created_at.strftime('%m/%d %H:%M')}")
         else:
             st.info("등록된 보호자가 없습니다.")
     
@@ -7,38 +7,186 @@ from src.services.guardian_service import GuardianService
 from src.services.course_service import CourseService
 from src.models.database import StudentStatus, Gender, RelationshipType
 from src.utils.auth import require_permission
-import tempfile
-import os
+import openpyxl
+from io import BytesIO
+
+# 학생 목록 테이블 컬럼 (마지막 ID 컬럼은 화면에서 숨김)
+_STUDENT_LIST_COLUMNS = ["선택", "학원번호", "이름", "성별", "학교", "학년", "수강과목",
+                         "학생연락처", "보호자", "보호자연락처", "상태", "등록일", "ID"]
+
+# 이 인원 이하면 체크박스 에디터 대신 가벼운 dataframe + selectbox 사용
+# (_PAGE_SIZE보다 작아야 함 — 페이지가 행 수를 _PAGE_SIZE로 자르므로
+# 같거나 크면 다중 선택 에디터 분기가 절대 실행되지 않는다)
+_LIGHTWEIGHT_LIST_LIMIT = 20
+
+# 학생 목록 페이지당 행 수
+_PAGE_SIZE = 50
+
+# 위젯 옵션/설정 모듈 상수 (rerun마다 리스트·dict를 다시 만들지 않음)
+_STATUS_OPTIONS = ["전체"] + [status.value for status in StudentStatus]
+_GENDER_OPTIONS = [None] + list(Gender)
+_RELATIONSHIP_OPTIONS = list(RelationshipType)
+_LIST_COLUMN_CONFIG = {
+    "선택": st.column_config.CheckboxColumn("선택", default=False),
+    "이름": st.column_config.TextColumn("이름", width="medium"),
+    "ID": st.column_config.Column(disabled=True)
+}
+_LIST_COLUMN_ORDER = [c for c in _STUDENT_LIST_COLUMNS if c != "ID"]
+
+# enum/학년 표시 문자열 매핑 (컬럼 단위 .map 벡터 변환용)
+_GENDER_LABELS = {g: g.value for g in Gender}
+_STATUS_LABELS = {s: s.value for s in StudentStatus}
+_GRADE_LABELS = {g: f"{g}학년" for g in range(1, 13)}
+
+def _students_version() -> int:
+    """현재 세션의 학생 데이터 캐시 버전"""
+    return st.session_state.setdefault('_students_v', 0)
+
+def _bump_students_version():
+    """학생 데이터 변경(등록/삭제/업로드) 후 캐시 무효화
+
+    전역 clear() 대신 캐시 키에 들어가는 버전만 올린다 — 다른 세션의
+    캐시는 유지되고, 이 세션도 같은 버전 내 재조회는 캐시를 탄다.
+    """
+    st.session_state['_students_v'] = st.session_state.get('_students_v', 0) + 1
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_student_rows(version, search, status, page=1, course_id=None):
+    """학생 목록 탭 표시용 (DataFrame, 전체 건수) 캐시
+
+    version은 _students_version() 무효화 토큰. 페이지 단위(limit/offset)로만
+    조회하므로 수천 명 규모에서도 전송·렌더 비용이 한 페이지 분량이다.
+    수강과목 필터는 쿼리 단계에서 적용 — 페이지/건수가 필터를 반영한다.
+    """
+    db = get_db_session()
+    try:
+        student_service = StudentService(db)
+        guardian_service = GuardianService(db)
+        course_service = CourseService(db)
+
+        total_count = student_service.count(search=search, status=status,
+                                            course_id=course_id)
+        students = student_service.get_all(
+            search=search, status=status, course_id=course_id,
+            limit=_PAGE_SIZE, offset=(page - 1) * _PAGE_SIZE
+        )
+
+        # 보호자 표시 문자열을 SQL GROUP_CONCAT 한 쿼리로 집계 (행 로딩 없음)
+        guardian_summary = guardian_service.get_guardian_summary_for_students([s.id for s in students])
+
+        rows = []
+        for student in students:
+            names_str, guardian_total, guardian_phone = guardian_summary.get(student.id, ('', 0, ''))
+            guardian_names = ", ".join(names_str.split(', ')[:2])  # 최대 2명만 표시
+            if guardian_total > 2:
+                guardian_names += f" 외 {guardian_total-2}명"
+
+            # 수강과목 정보 가져오기
+            enrollments = course_service.get_student_enrollments(student.id)
+            course_names = [e.course.name for e in enrollments if e.course][:2]  # 최대 2개만 표시
+            course_display = ", ".join(course_names)
+            if len(enrollments) > 2:
+                course_display += f" 외 {len(enrollments)-2}개"
+
+            rows.append((
+                False,
+                student.academy_id,
+                student.name,
+                student.gender,
+                student.school_name or "",
+                student.grade,
+                course_display or "없음",
+                student.phone or "",
+                guardian_names,
+                guardian_phone,
+                student.status,
+                student.enrollment_date,
+                student.id
+            ))
+
+        df = pd.DataFrame.from_records(rows, columns=_STUDENT_LIST_COLUMNS)
+
+        # enum/날짜 표시 변환은 행별 분기 대신 컬럼 단위 벡터 연산으로
+        df["성별"] = df["성별"].map(_GENDER_LABELS).fillna("")
+        df["학년"] = df["학년"].map(_GRADE_LABELS).fillna("")
+        df["상태"] = df["상태"].map(_STATUS_LABELS)
+        df["등록일"] = pd.to_datetime(df["등록일"]).dt.strftime("%Y-%m-%d").fillna("")
+
+        return df, total_count
+    finally:
+        db.close()
+
+def _template_xlsx_bytes(template_data):
+    """템플릿 dict를 메모리 내 xlsx 바이트로 변환 (임시파일/판다스 경유 없음)"""
+    buf = BytesIO()
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('template')
+    ws.append(list(template_data.keys()))
+    for row in zip(*template_data.values()):
+        ws.append(list(row))
+    wb.save(buf)
+    return buf.getvalue()
 
 def render():
     """학생 관리 페이지 렌더링"""
     st.title("👨‍🎓 학생 관리")
-    
-    # 탭 생성
+
+    # 탭 생성 (각 탭은 fragment로 격리되어 해당 탭만 재실행됨)
     tab1, tab2, tab3, tab4 = st.tabs(["📋 학생 목록", "➕ 학생 등록", "📤 엑셀 관리", "📊 통계"])
-    
+
+    with tab1:
+        render_student_list_tab()
+
+    with tab2:
+        render_student_registration_tab()
+
+    with tab3:
+        render_excel_management_tab()
+
+    with tab4:
+        render_student_statistics_tab()
+
+@st.fragment
+def render_student_list_tab():
+    """학생 목록 탭 (fragment — 탭 내 상호작용 시 이 블록만 재실행)"""
     db = get_db_session()
-    
     try:
-        student_service = StudentService(db)
-        guardian_service = GuardianService(db)
-        course_service = CourseService(db)
-        
-        
-        with tab1:
-            render_student_list(student_service, guardian_service, course_service)
-        
-        with tab2:
-            render_student_registration(student_service, guardian_service, course_service)
-        
-        with tab3:
-            render_excel_management(student_service, guardian_service)
-        
-        with tab4:
-            render_student_statistics(student_service, guardian_service)
-            
+        render_student_list(StudentService(db), GuardianService(db), CourseService(db))
+    except Exception as e:
+        st.error(f"학생 목록 로딩 중 오류 발생: {str(e)}")
+    finally:
+        db.close()
+
+@st.fragment
+def render_student_registration_tab():
+    """학생 등록 탭"""
+    db = get_db_session()
+    try:
+        render_student_registration(StudentService(db), GuardianService(db), CourseService(db))
+    except Exception as e:
+        st.error(f"학생 등록 로딩 중 오류 발생: {str(e)}")
+    finally:
+        db.close()
+
+@st.fragment
+def render_excel_management_tab():
+    """엑셀 관리 탭"""
+    db = get_db_session()
+    try:
+        render_excel_management(StudentService(db), GuardianService(db))
     except Exception as e:
-        st.error(f"페이지 로딩 중 오류 발생: {str(e)}")
+        st.error(f"엑셀 관리 로딩 중 오류 발생: {str(e)}")
+    finally:
+        db.close()
+
+@st.fragment
+def render_student_statistics_tab():
+    """통계 탭"""
+    db = get_db_session()
+    try:
+        render_student_statistics(StudentService(db), GuardianService(db))
+    except Exception as e:
+        st.error(f"통계 로딩 중 오류 발생: {str(e)}")
     finally:
         db.close()
 
@@ -53,7 +201,7 @@ def render_student_list(student_service, guardian_service, course_service):
         search_term = st.text_input("🔍 검색", placeholder="이름, 학교, 연락처, 학원등록번호")
     
     with col2:
-        status_filter = st.selectbox("상태", ["전체"] + [status.value for status in StudentStatus])
+        status_filter = st.selectbox("상태", _STATUS_OPTIONS)
     
     with col3:
         # 수강과목 필터
@@ -66,96 +214,100 @@ def render_student_list(student_service, guardian_service, course_service):
         if st.button("🔄 새로고침"):
             st.rerun()
     
-    # 학생 목록 조회
-    students = student_service.get_all(
-        search=search_term,
-        status=None if status_filter == "전체" else status_filter
-    )
-    
-    # 수강과목 필터링
+    # 수강과목 필터 — 옵션 순서가 courses와 같으므로 인덱스로 id 해석
+    # (쿼리 단계에서 걸러야 페이지·건수가 필터를 반영한다)
+    course_id = None
     if selected_course != "전체":
-        # 선택된 수강과목에 등록된 학생들만 필터링
-        selected_course_name = selected_course.split(" (")[0]  # 과목명만 추출
-        course = next((c for c in courses if c.name == selected_course_name), None)
-        
-        if course:
-            course_enrollments = course_service.get_course_enrollments(course.id)
-            enrolled_student_ids = [e.student_id for e in course_enrollments]
-            students = [s for s in students if s.id in enrolled_student_ids]
-    
-    if students:
-        # 학생 정보를 데이터프레임으로 변환
-        student_data = []
-        for student in students:
-            # 보호자 정보 가져오기
-            guardians = guardian_service.get_guardians_by_student(student.id)
-            guardian_names = ", ".join([g.name for g in guardians[:2]])  # 최대 2명만 표시
-            if len(guardians) > 2:
-                guardian_names += f" 외 {len(guardians)-2}명"
-            
-            # 주보호자 연락처
-            primary_guardian = next((g for g in guardians if g.is_primary), guardians[0] if guardians else None)
-            guardian_phone = primary_guardian.phone if primary_guardian else ""
-            
-            # 수강과목 정보 가져오기
-            enrollments = course_service.get_student_enrollments(student.id)
-            course_names = [e.course.name for e in enrollments if e.course][:2]  # 최대 2개만 표시
-            course_display = ", ".join(course_names)
-            if len(enrollments) > 2:
-                course_display += f" 외 {len(enrollments)-2}개"
-            
-            student_data.append({
-                "선택": False,
-                "학원번호": student.academy_id,
-                "이름": student.name,
-                "성별": student.gender.value if student.gender else "",
-                "학교": student.school_name or "",
-                "학년": f"{student.grade}학년" if student.grade else "",
-                "수강과목": course_display or "없음",
-                "학생연락처": student.phone or "",
-                "보호자": guardian_names,
-                "보호자연락처": guardian_phone,
-                "상태": student.status.value,
-                "등록일": student.enrollment_date.strftime("%Y-%m-%d") if student.enrollment_date else "",
-                "ID": student.id
-            })
-        
-        df = pd.DataFrame(student_data)
-        
-        # 데이터 표시 (ID 컬럼 숨김)
-        edited_df = st.data_editor(
-            df.drop(columns=["ID"]),
-            use_container_width=True,
-            hide_index=True,
-            column_config={
-                "선택": st.column_config.CheckboxColumn("선택", default=False),
-                "이름": st.column_config.TextColumn("이름", width="medium")
-            }
+        course_id = courses[course_options.index(selected_course) - 1].id
+
+    # 학생 목록 조회 (캐시 — 같은 검색/필터/페이지 조합은 TTL 내 재조회하지 않음)
+    page = st.session_state.get("students_page", 1)
+    df, total_count = _load_student_rows(
+        _students_version(),
+        search_term,
+        None if status_filter == "전체" else status_filter,
+        page,
+        course_id
+    )
+
+    # 페이지네이션 (한 번에 _PAGE_SIZE명씩만 조회·렌더)
+    total_pages = max(1, -(-total_count // _PAGE_SIZE))
+    if page > total_pages:
+        # 뒷페이지를 보던 중 검색/상태/수강과목 필터가 좁아지면 기존 페이지
+        # 번호가 범위를 벗어나 빈 목록이 나온다 — 마지막 페이지로 보정 후 재조회
+        page = total_pages
+        st.session_state["students_page"] = page
+        df, total_count = _load_student_rows(
+            _students_version(),
+            search_term,
+            None if status_filter == "전체" else status_filter,
+            page,
+            course_id
         )
-        
-        # 선택된 학생들의 상세 정보 표시
-        selected_indices = edited_df[edited_df["선택"] == True].index.tolist()
-        
-        if selected_indices:
+    if total_pages > 1:
+        page_col, info_col = st.columns([1, 3])
+        with page_col:
+            st.number_input("페이지", min_value=1, max_value=total_pages,
+                            step=1, key="students_page")
+        with info_col:
+            st.caption(f"총 {total_count}명 · {total_pages}페이지")
+
+    if not df.empty:
+        if len(df) <= _LIGHTWEIGHT_LIST_LIMIT:
+            # 소규모 목록은 data_editor 대신 가벼운 dataframe + selectbox로 표시
+            # (편집 가능한 data_editor는 Arrow 직렬화 비용이 커서 초기 렌더가 느림)
+            st.dataframe(
+                df.drop(columns=["선택", "ID"]),
+                use_container_width=True,
+                hide_index=True
+            )
+
+            name_by_id = {
+                sid: f"{name} ({academy_id})"
+                for sid, name, academy_id in zip(df["ID"], df["이름"], df["학원번호"])
+            }
+            selected_id = st.selectbox(
+                "👤 상세 보기",
+                options=[None] + list(name_by_id.keys()),
+                format_func=lambda i: "선택하세요" if i is None else name_by_id[i]
+            )
+            selected_ids = [selected_id] if selected_id is not None else []
+        else:
+            # 데이터 표시 (ID 컬럼은 column_order에서 제외해 숨김 — 정렬해도 행↔학생 매핑 유지)
+            edited_df = st.data_editor(
+                df,
+                use_container_width=True,
+                hide_index=True,
+                column_order=_LIST_COLUMN_ORDER,
+                column_config=_LIST_COLUMN_CONFIG
+            )
+
+            # 선택된 학생들의 상세 정보 표시 (행 인덱스가 아닌 ID로 조회)
+            selected_ids = edited_df.loc[edited_df["선택"], "ID"].tolist()
+
+        if selected_ids:
             st.markdown("---")
             st.subheader("👤 선택된 학생 상세 정보")
-            
-            for idx in selected_indices:
-                if idx < len(students):
-                    student = students[idx]
-                    render_student_with_family_detail(student, student_service, guardian_service)
-    
+
+            # 선택된 학생들의 보호자를 한 번에 조회해 상세 렌더러로 전달
+            guardians_map = guardian_service.get_guardians_for_students(selected_ids)
+
+            for student_id in selected_ids:
+                student = student_service.get_by_id(student_id)
+                if student:
+                    render_student_with_family_detail(
+                        student, guardians_map.get(student_id, []),
+                        student_service, guardian_service
+                    )
+
     else:
         st.info("등록된 학생이 없습니다.")
 
-def render_student_with_family_detail(student, student_service, guardian_service):
-    """학생과 가족 정보를 함께 상세 표시"""
+def render_student_with_family_detail(student, guardians, student_service, guardian_service):
+    """학생과 가족 정보를 함께 상세 표시 (보호자는 목록에서 배치 조회해 전달)"""
     st.markdown("---")
     st.subheader(f"📄 {student.name} 학생 및 가족 정보")
-    
-    # 보호자 정보 가져오기
-    guardians = guardian_service.get_guardians_by_student(student.id)
-    
+
     # 탭으로 학생 정보와 가족 정보 분리
     tab1, tab2, tab3 = st.tabs(["👤 학생 정보", "👨‍👩‍👧‍👦 가족 정보", "⚙️ 관리"])
     
@@ -258,6 +410,7 @@ def render_student_with_family_detail(student, student_service, guardian_service
                 if st.confirm("정말 삭제하시겠습니까? 연결된 보호자 정보도 함께 삭제됩니다."):
                     try:
                         student_service.delete_student(student.id)
+                        _bump_students_version()
                         st.success("학생이 삭제되었습니다.")
                         st.rerun()
                     except Exception as e:
@@ -299,7 +452,7 @@ def render_student_family_contact(student_family_data):
     # 빠른 연락 버튼
     if guardians:
         st.write("**빠른 연락**")
-        primary_guardian = next((g for g in guardians if g.is_primary), guardians[0])
+        primary_guardian = guardians[0]  # is_primary DESC 정렬
         
         col3, col4 = st.columns(2)
         
@@ -323,7 +476,7 @@ def render_student_registration(student_service, guardian_service, course_servic
         
         with col1:
             student_name = st.text_input("학생 이름*", placeholder="학생 이름")
-            student_gender = st.selectbox("성별*", [None] + list(Gender), format_func=lambda x: "선택하세요" if x is None else x.value)
+            student_gender = st.selectbox("성별*", _GENDER_OPTIONS, format_func=lambda x: "선택하세요" if x is None else x.value)
             student_birth_date = st.date_input("생년월일")
             student_phone = st.text_input("학생 연락처", placeholder="010-0000-0000")
         
@@ -354,7 +507,7 @@ def render_student_registration(student_service, guardian_service, course_servic
             
             with col5:
                 guardian1_name = st.text_input("보호자 이름*", key="g1_name", placeholder="보호자 이름")
-                guardian1_relationship = st.selectbox("관계*", list(RelationshipType), 
+                guardian1_relationship = st.selectbox("관계*", _RELATIONSHIP_OPTIONS,
                                                     format_func=lambda x: x.value, key="g1_rel")
                 guardian1_phone = st.text_input("연락처*", key="g1_phone", placeholder="010-0000-0000")
                 guardian1_email = st.text_input("이메일", key="g1_email", placeholder="guardian@example.com")
@@ -376,7 +529,7 @@ def render_student_registration(student_service, guardian_service, course_servic
                 
                 with col7:
                     guardian2_name = st.text_input("보호자 이름", key="g2_name", placeholder="보호자 이름")
-                    guardian2_relationship = st.selectbox("관계", list(RelationshipType), 
+                    guardian2_relationship = st.selectbox("관계", _RELATIONSHIP_OPTIONS,
                                                         format_func=lambda x: x.value, key="g2_rel")
                     guardian2_phone = st.text_input("연락처", key="g2_phone", placeholder="010-0000-0000")
                     guardian2_email = st.text_input("이메일", key="g2_email", placeholder="guardian@example.com")
@@ -440,10 +593,7 @@ def render_student_registration(student_service, guardian_service, course_servic
                     'notes': notes
                 }
                 
-                # 학생 등록
-                student = student_service.create(student_data)
-                
-                # 주보호자 등록
+                # 주보호자 정보
                 guardian1_data = {
                     'name': guardian1_name,
                     'relationship_type': guardian1_relationship,
@@ -462,10 +612,9 @@ def render_student_registration(student_service, guardian_service, course_servic
                     'phone_enabled': True
                 }
                 
-                guardian1 = guardian_service.create_guardian(guardian1_data)
-                guardian_service.link_guardian_to_student(guardian1.id, student.id)
-                
-                # 추가 보호자 등록
+                guardian_list = [guardian1_data]
+
+                # 추가 보호자 정보
                 if add_second_guardian and guardian2_name and guardian2_phone:
                     guardian2_data = {
                         'name': guardian2_name,
@@ -485,9 +634,11 @@ def render_student_registration(student_service, guardian_service, course_servic
                         'phone_enabled': True
                     }
                     
-                    guardian2 = guardian_service.create_guardian(guardian2_data)
-                    guardian_service.link_guardian_to_student(guardian2.id, student.id)
-                
+                    guardian_list.append(guardian2_data)
+
+                # 학생 + 보호자 일괄 등록 (단일 트랜잭션)
+                student = student_service.create_student_with_guardians(student_data, guardian_list)
+
                 # 수강과목 등록
                 enrolled_courses = []
                 course_errors = []
@@ -514,8 +665,9 @@ def render_student_registration(student_service, guardian_service, course_servic
                 
                 st.balloons()  # 축하 애니메이션
                 st.info("📋 **등록된 학생을 확인하려면 '학생 목록' 탭을 클릭하세요!**")
-                
+
                 # 폼을 초기화하기 위해 페이지 새로고침
+                _bump_students_version()
                 st.rerun()
                 
             except Exception as e:
@@ -549,22 +701,12 @@ def render_excel_management(student_service, guardian_service):
                 '특이사항': ['', '']
             }
             
-            df_template = pd.DataFrame(template_data)
-            
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                df_template.to_excel(tmp_file.name, index=False, engine='openpyxl')
-                
-                with open(tmp_file.name, 'rb') as f:
-                    st.download_button(
-                        label="💾 학생 템플릿 다운로드",
-                        data=f.read(),
-                        file_name="학생_업로드_템플릿.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
-                
-                # 임시 파일 삭제
-                os.unlink(tmp_file.name)
+            st.download_button(
+                label="💾 학생 템플릿 다운로드",
+                data=_template_xlsx_bytes(template_data),
+                file_name="학생_업로드_템플릿.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
         
         # 학생 파일 업로드
         student_uploaded_file = st.file_uploader(
@@ -577,24 +719,19 @@ def render_excel_management(student_service, guardian_service):
         if student_uploaded_file is not None:
             if st.button("📤 학생 업로드 실행"):
                 try:
-                    # 임시 파일로 저장
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                        tmp_file.write(student_uploaded_file.getvalue())
-                        
-                        result = student_service.import_students_from_excel(tmp_file.name)
-                        
-                        st.success(f"✅ 학생 업로드 완료: {result['success_count']}명 성공")
-                        st.info("📋 업로드된 학생을 확인하려면 '학생 목록' 탭을 클릭하세요.")
-                        
-                        if result['error_count'] > 0:
-                            st.warning(f"⚠️ 오류: {result['error_count']}건")
-                            with st.expander("오류 상세"):
-                                for error in result['errors']:
-                                    st.write(f"• {error}")
-                        
-                        # 임시 파일 삭제
-                        os.unlink(tmp_file.name)
-                        
+                    # 업로드 바이트를 임시파일 경유 없이 바로 파싱
+                    result = student_service.import_from_excel(BytesIO(student_uploaded_file.getvalue()))
+
+                    _bump_students_version()
+                    st.success(f"✅ 학생 업로드 완료: {result['success_count']}명 성공")
+                    st.info("📋 업로드된 학생을 확인하려면 '학생 목록' 탭을 클릭하세요.")
+
+                    if result['error_count'] > 0:
+                        st.warning(f"⚠️ 오류: {result['error_count']}건")
+                        with st.expander("오류 상세"):
+                            for error in result['errors']:
+                                st.write(f"• {error}")
+
                 except Exception as e:
                     st.error(f"학생 업로드 실패: {str(e)}")
     
@@ -617,22 +754,12 @@ def render_excel_management(student_service, guardian_service):
                 '주보호자': ['Y', 'N']
             }
             
-            df_template = pd.DataFrame(template_data)
-            
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                df_template.to_excel(tmp_file.name, index=False, engine='openpyxl')
-                
-                with open(tmp_file.name, 'rb') as f:
-                    st.download_button(
-                        label="💾 보호자 템플릿 다운로드",
-                        data=f.read(),
-                        file_name="보호자_업로드_템플릿.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
-                
-                # 임시 파일 삭제
-                os.unlink(tmp_file.name)
+            st.download_button(
+                label="💾 보호자 템플릿 다운로드",
+                data=_template_xlsx_bytes(template_data),
+                file_name="보호자_업로드_템플릿.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
         
         # 보호자 파일 업로드
         guardian_uploaded_file = st.file_uploader(
@@ -645,99 +772,95 @@ def render_excel_management(student_service, guardian_service):
         if guardian_uploaded_file is not None:
             if st.button("📤 보호자 업로드 실행"):
                 try:
-                    # 임시 파일로 저장
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                        tmp_file.write(guardian_uploaded_file.getvalue())
-                        
-                        result = guardian_service.import_guardians_from_excel(tmp_file.name)
-                        
-                        st.success(f"✅ 보호자 업로드 완료: {result['success_count']}명 성공")
-                        st.info("📋 업로드된 보호자를 확인하려면 '학생 목록' 탭을 클릭하세요.")
-                        
-                        if result['error_count'] > 0:
-                            st.warning(f"⚠️ 오류: {result['error_count']}건")
-                            with st.expander("오류 상세"):
-                                for error in result['errors']:
-                                    st.write(f"• {error}")
-                        
-                        # 임시 파일 삭제
-                        os.unlink(tmp_file.name)
-                        
+                    # 업로드 바이트를 임시파일 경유 없이 바로 파싱
+                    result = guardian_service.import_from_excel(BytesIO(guardian_uploaded_file.getvalue()))
+
+                    _bump_students_version()
+                    st.success(f"✅ 보호자 업로드 완료: {result['success_count']}명 성공")
+                    st.info("📋 업로드된 보호자를 확인하려면 '학생 목록' 탭을 클릭하세요.")
+
+                    if result['error_count'] > 0:
+                        st.warning(f"⚠️ 오류: {result['error_count']}건")
+                        with st.expander("오류 상세"):
+                            for error in result['errors']:
+                                st.write(f"• {error}")
+
                 except Exception as e:
                     st.error(f"보호자 업로드 실패: {str(e)}")
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_student_statistics(version):
+    """통계 탭 집계 캐시 — SQL 집계만 사용하므로 전체 행을 로딩하지 않음"""
+    db = get_db_session()
+    try:
+        stats = StudentService(db).get_statistics()
+        stats['total_guardians'] = GuardianService(db).count_all()
+        return stats
+    finally:
+        db.close()
+
+_GENDER_CHART_LABELS = {'남': '남학생', '여': '여학생'}
+
 def render_student_statistics(student_service, guardian_service):
     """학생 통계"""
     st.subheader("📊 학생 통계")
-    
+
     try:
-        # 기본 통계
-        students = student_service.get_all()
-        guardians = guardian_service.get_all_guardians()
-        
+        stats = _load_student_statistics(_students_version())
+
         col1, col2, col3, col4 = st.columns(4)
-        
+
         with col1:
-            st.metric("총 학생 수", f"{len(students)}명")
-        
+            st.metric("총 학생 수", f"{stats['total_students']}명")
+
         with col2:
-            active_students = len([s for s in students if s.status == StudentStatus.ACTIVE])
-            st.metric("재학생", f"{active_students}명")
-        
+            st.metric("재학생", f"{stats['active_students']}명")
+
         with col3:
-            st.metric("총 보호자 수", f"{len(guardians)}명")
-        
+            st.metric("총 보호자 수", f"{stats['total_guardians']}명")
+
         with col4:
-            if students:
-                avg_guardians = len(guardians) / len(students)
+            if stats['total_students'] > 0:
+                avg_guardians = stats['total_guardians'] / stats['total_students']
                 st.metric("학생당 평균 보호자", f"{avg_guardians:.1f}명")
-        
+
         # 성별 분포
-        if students:
-            st.write("### 성별 분포")
-            gender_count = {}
-            for student in students:
-                if student.gender:
-                    gender_name = "남학생" if student.gender == Gender.MALE else "여학생"
-                    gender_count[gender_name] = gender_count.get(gender_name, 0) + 1
-            
-            if gender_count and len(gender_count) > 0:
-                gender_df = pd.DataFrame(list(gender_count.items()), columns=['성별', '인원'])
-                # 데이터 유효성 확인
-                if not gender_df.empty and gender_df['인원'].sum() > 0:
-                    st.bar_chart(gender_df.set_index('성별'))
-                else:
-                    st.info("성별 데이터가 충분하지 않습니다.")
+        st.write("### 성별 분포")
+        gender_count = {
+            _GENDER_CHART_LABELS.get(gender, gender): count
+            for gender, count in stats['gender_distribution'].items()
+        }
+
+        if gender_count:
+            gender_df = pd.DataFrame(list(gender_count.items()), columns=['성별', '인원'])
+            # 데이터 유효성 확인
+            if not gender_df.empty and gender_df['인원'].sum() > 0:
+                st.bar_chart(gender_df.set_index('성별'))
             else:
-                st.info("성별 분포 데이터가 없습니다.")
-        
+                st.info("성별 데이터가 충분하지 않습니다.")
+        else:
+            st.info("성별 분포 데이터가 없습니다.")
+
         # 학년별 분포
-        if students:
-            st.write("### 학년별 분포")
-            grade_count = {}
-            for student in students:
-                if student.grade:
-                    grade_name = f"{student.grade}학년"
-                    grade_count[grade_name] = grade_count.get(grade_name, 0) + 1
-            
-            if grade_count and len(grade_count) > 0:
-                grade_df = pd.DataFrame(list(grade_count.items()), columns=['학년', '인원'])
-                # 데이터 유효성 확인
-                if not grade_df.empty and grade_df['인원'].sum() > 0:
-                    st.bar_chart(grade_df.set_index('학년'))
-                else:
-                    st.info("학년 데이터가 충분하지 않습니다.")
+        st.write("### 학년별 분포")
+        grade_count = stats['grade_distribution']
+
+        if grade_count:
+            grade_df = pd.DataFrame(list(grade_count.items()), columns=['학년', '인원'])
+            # 데이터 유효성 확인
+            if not grade_df.empty and grade_df['인원'].sum() > 0:
+                st.bar_chart(grade_df.set_index('학년'))
             else:
-                st.info("학년 분포 데이터가 없습니다.")
-        
+                st.info("학년 데이터가 충분하지 않습니다.")
+        else:
+            st.info("학년 분포 데이터가 없습니다.")
+
         # 최근 등록 현황
         st.write("### 최근 등록 현황 (30일)")
-        recent_students = [s for s in students if s.enrollment_date and (date.today() - s.enrollment_date).days <= 30]
-        
-        if recent_students:
-            st.success(f"✅ 최근 30일간 {len(recent_students)}명의 학생이 등록되었습니다.")
+        if stats['recent_students'] > 0:
+            st.success(f"✅ 최근 30일간 {stats['recent_students']}명의 학생이 등록되었습니다.")
         else:
             st.info("최근 30일간 등록된 학생이 없습니다.")
-        
+
     except Exception as e:
         st.error(f"통계 로딩 실패: {str(e)}")
\ No newline at end of file
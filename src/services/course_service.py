@@ -1,11 +1,25 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, selectinload, contains_eager
+from sqlalchemy import func, and_, or_, select, insert, literal, case, exists, bindparam
 from datetime import datetime, date
 from typing import List, Optional, Dict, Any
-import pandas as pd
 
 from src.models.database import Course, Subject, Enrollment, Student, EnrollmentStatus, CourseStatus
 
+# 자주 실행되는 집계는 모듈 상수 select()로 한 번만 구성한다.
+# 엔진의 컴파일 캐시가 같은 구문 객체를 재사용하므로 호출마다
+# 쿼리 빌드·컴파일 비용을 내지 않는다.
+_COUNT_ACTIVE_ENROLLMENTS = select(func.count()).select_from(Enrollment).where(
+    and_(
+        Enrollment.course_id == bindparam('course_id'),
+        Enrollment.status == EnrollmentStatus.ACTIVE
+    )
+)
+
+# 수정 가능 컬럼 화이트리스트 (키마다 hasattr 리플렉션을 돌리지 않기 위해
+# 테이블 컬럼명 집합을 한 번만 계산해 둔다)
+_SUBJECT_UPDATABLE = frozenset(c.name for c in Subject.__table__.columns) - {'id', 'created_at'}
+_COURSE_UPDATABLE = frozenset(c.name for c in Course.__table__.columns) - {'id', 'created_at'}
+
 
 class CourseService:
     def __init__(self, db: Session):
@@ -16,8 +30,9 @@ class CourseService:
         """새 과목 생성"""
         subject = Subject(**data)
         self.db.add(subject)
+        # PK는 flush(lastrowid)로, 기본값(created_at 등)은 클라이언트 측에서
+        # 채워지므로 commit 후 refresh(SELECT 재조회)가 필요 없다
         self.db.commit()
-        self.db.refresh(subject)
         return subject
 
     def get_subjects(self, active_only: bool = True) -> List[Subject]:
@@ -27,9 +42,19 @@ class CourseService:
             query = query.filter(Subject.is_active == True)
         return query.order_by(Subject.name).all()
 
+    def get_subjects_with_course_counts(self, active_only: bool = True) -> List[tuple]:
+        """과목별 수강과목 수를 함께 조회 ((Subject, course_count) 목록)"""
+        query = self.db.query(
+            Subject,
+            func.count(Course.id).label('course_count')
+        ).outerjoin(Course)
+        if active_only:
+            query = query.filter(Subject.is_active == True)
+        return query.group_by(Subject.id).order_by(Subject.name).all()
+
     def get_subject(self, subject_id: int) -> Optional[Subject]:
-        """ID로 과목 조회"""
-        return self.db.query(Subject).filter(Subject.id == subject_id).first()
+        """ID로 과목 조회 (identity map 우선 — 같은 트랜잭션 내 재조회는 SQL 생략)"""
+        return self.db.get(Subject, subject_id)
 
     def update_subject(self, subject_id: int, data: Dict[str, Any]) -> Optional[Subject]:
         """과목 정보 수정"""
@@ -38,9 +63,9 @@ class CourseService:
             return None
             
         for field_name, value in data.items():
-            if hasattr(subject, field_name):
+            if field_name in _SUBJECT_UPDATABLE:
                 setattr(subject, field_name, value)
-        
+
         self.db.commit()
         self.db.refresh(subject)
         return subject
@@ -61,7 +86,6 @@ class CourseService:
         new_course = Course(**course_info)
         self.db.add(new_course)
         self.db.commit()
-        self.db.refresh(new_course)
         return new_course
 
     def get_courses(self, 
@@ -69,7 +93,9 @@ class CourseService:
                         status: Optional[str] = None,
                         search_term: Optional[str] = None) -> List[Course]:
         """모든 수강과목 조회"""
-        query = self.db.query(Course).join(Subject)
+        # Subject는 이미 조인되어 있으므로 contains_eager로 같은 행에서 채운다
+        # (selectinload의 추가 쿼리 1개도 생략)
+        query = self.db.query(Course).join(Subject).options(contains_eager(Course.subject))
         
         if subject_id:
             query = query.filter(Course.subject_id == subject_id)
@@ -88,9 +114,54 @@ class CourseService:
         
         return query.order_by(Course.name).all()
 
+    def list_courses_for_table(self,
+                               subject_id: Optional[int] = None,
+                               status: Optional[str] = None,
+                               search_term: Optional[str] = None) -> List[Any]:
+        """목록 화면에 표시되는 컬럼만 조회 (ORM 엔티티 전체 로딩 회피)
+
+        수강생 수는 스칼라 서브쿼리로 같은 쿼리에서 함께 계산한다.
+        """
+        enrollment_count = select(func.count(Enrollment.id)).where(
+            and_(
+                Enrollment.course_id == Course.id,
+                Enrollment.status == EnrollmentStatus.ACTIVE
+            )
+        ).correlate(Course).scalar_subquery()
+
+        stmt = select(
+            Course.id,
+            Course.name,
+            Subject.name.label('subject_name'),
+            Course.level,
+            Course.capacity,
+            enrollment_count.label('enrollment_count'),
+            Course.schedule_info,
+            Course.status,
+            Course.start_date,
+            Course.end_date
+        ).join(Subject)
+
+        if subject_id:
+            stmt = stmt.where(Course.subject_id == subject_id)
+
+        if status:
+            stmt = stmt.where(Course.status == CourseStatus(status))
+
+        if search_term:
+            stmt = stmt.where(
+                or_(
+                    Course.name.contains(search_term),
+                    Subject.name.contains(search_term),
+                    Course.level.contains(search_term)
+                )
+            )
+
+        return self.db.execute(stmt.order_by(Course.name)).all()
+
     def get_course(self, course_id: int) -> Optional[Course]:
-        """ID로 수강과목 조회"""
-        return self.db.query(Course).filter(Course.id == course_id).first()
+        """ID로 수강과목 조회 (identity map 우선 — 같은 트랜잭션 내 재조회는 SQL 생략)"""
+        return self.db.get(Course, course_id)
 
     def update_course(self, course_id: int, update_data: Dict[str, Any]) -> Optional[Course]:
         """수강과목 정보 수정"""
@@ -99,9 +170,9 @@ class CourseService:
             return None
             
         for field_name, value in update_data.items():
-            if hasattr(course, field_name):
+            if field_name in _COURSE_UPDATABLE:
                 setattr(course, field_name, value)
-        
+
         self.db.commit()
         self.db.refresh(course)
         return course
@@ -112,14 +183,9 @@ class CourseService:
         if not course:
             return False
         
-        # 수강중인 학생이 있는지 확인
-        active_student_count = self.db.query(Enrollment).filter(
-            and_(
-                Enrollment.course_id == course_id,
-                Enrollment.status == EnrollmentStatus.ACTIVE
-            )
-        ).count()
-        
+        # 수강중인 학생이 있는지 확인 (서브쿼리 래핑 없는 평평한 집계)
+        active_student_count = self.count_enrollments(course_id)
+
         if active_student_count > 0:
             raise ValueError(f"수강중인 학생이 {active_student_count}명 있어서 삭제할 수 없습니다.")
         
@@ -129,49 +195,140 @@ class CourseService:
 
     # ========== 수강신청 관리 ==========
     def enroll(self, student_id: int, course_id: int, enrollment_info: Optional[Dict[str, Any]] = None) -> Enrollment:
-        """학생 수강신청"""
-        # 이미 수강중인지 확인
-        current_enrollment = self.db.query(Enrollment).filter(
+        """학생 수강신청
+
+        존재/중복/정원 검사와 INSERT를 한 문장(INSERT ... SELECT ... WHERE)으로
+        묶어 왕복을 줄이고, 검사-삽입 사이의 정원 초과 경쟁 조건을 없앤다.
+        실패 시에만 원인 진단 쿼리를 한 번 더 실행한다.
+        """
+        enrollment_data = {
+            'student_id': student_id,
+            'course_id': course_id,
+            'enrollment_date': date.today(),
+            'start_date': enrollment_info.get('start_date', date.today()) if enrollment_info else date.today(),
+            'status': EnrollmentStatus.ACTIVE
+        }
+
+        if enrollment_info:
+            enrollment_data.update(enrollment_info)
+
+        active_count = select(func.count(Enrollment.id)).where(
+            and_(
+                Enrollment.course_id == course_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE
+            )
+        ).scalar_subquery()
+
+        already_enrolled = select(Enrollment.id).where(
+            and_(
+                Enrollment.student_id == student_id,
+                Enrollment.course_id == course_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE
+            )
+        ).exists()
+
+        columns = list(enrollment_data.keys())
+        source = select(
+            *[
+                literal(value, type_=Enrollment.__table__.c[name].type)
+                for name, value in enrollment_data.items()
+            ]
+        ).where(
+            and_(
+                Course.id == course_id,
+                active_count < Course.capacity,
+                ~already_enrolled
+            )
+        )
+
+        result = self.db.execute(insert(Enrollment).from_select(columns, source))
+
+        if result.rowcount == 0:
+            # 실패 원인 진단 (정원/수강생 수/중복 여부를 한 쿼리로)
+            self.db.rollback()
+            row = self.db.execute(
+                select(Course.capacity, active_count, already_enrolled).where(Course.id == course_id)
+            ).first()
+
+            if row is None:
+                raise ValueError("존재하지 않는 수강과목입니다.")
+            if row[2]:
+                raise ValueError("이미 이 수강과목에 등록되어 있습니다.")
+            raise ValueError("수강과목 정원이 초과되었습니다.")
+
+        self.db.commit()
+
+        return self.db.query(Enrollment).filter(
             and_(
                 Enrollment.student_id == student_id,
                 Enrollment.course_id == course_id,
                 Enrollment.status == EnrollmentStatus.ACTIVE
             )
         ).first()
-        
-        if current_enrollment:
-            raise ValueError("이미 이 수강과목에 등록되어 있습니다.")
-        
-        # 수강과목 정원 확인
+
+    def enroll_many(self, student_ids: List[int], course_id: int) -> int:
+        """여러 학생을 한 트랜잭션으로 수강신청 (executemany)"""
+        if not student_ids:
+            return 0
+
         course = self.get_course(course_id)
         if not course:
             raise ValueError("존재하지 않는 수강과목입니다.")
-        
-        current_student_count = self.count_enrollments(course_id)
-        if current_student_count >= course.capacity:
-            raise ValueError("수강과목 정원이 초과되었습니다.")
-        
-        # 수강신청 생성
-        enrollment_data = {
-            'student_id': student_id,
-            'course_id': course_id,
-            'enrollment_date': date.today(),
-            'start_date': enrollment_info.get('start_date', date.today()) if enrollment_info else date.today(),
-            'status': EnrollmentStatus.ACTIVE
+
+        # 이미 수강중인 학생은 제외
+        already_enrolled = {
+            student_id for (student_id,) in self.db.query(Enrollment.student_id).filter(
+                and_(
+                    Enrollment.course_id == course_id,
+                    Enrollment.status == EnrollmentStatus.ACTIVE,
+                    Enrollment.student_id.in_(student_ids)
+                )
+            ).all()
         }
-        
-        if enrollment_info:
-            enrollment_data.update(enrollment_info)
-        
-        new_enrollment = Enrollment(**enrollment_data)
-        self.db.add(new_enrollment)
+        new_student_ids = [s for s in student_ids if s not in already_enrolled]
+        if not new_student_ids:
+            return 0
+
+        # 남은 정원만큼만 등록 (초과분은 잘라내고 등록된 인원 수를 반환)
+        free = course.capacity - self.count_enrollments(course_id)
+        if free <= 0:
+            raise ValueError("수강과목 정원이 초과되었습니다.")
+        new_student_ids = new_student_ids[:free]
+
+        today = date.today()
+        self.db.execute(
+            insert(Enrollment),
+            [
+                {
+                    'student_id': student_id,
+                    'course_id': course_id,
+                    'enrollment_date': today,
+                    'start_date': today,
+                    'status': EnrollmentStatus.ACTIVE
+                }
+                for student_id in new_student_ids
+            ]
+        )
         self.db.commit()
-        self.db.refresh(new_enrollment)
-        return new_enrollment
+        return len(new_student_ids)
+
+    def unenroll_many(self, enrollment_ids: List[int]) -> int:
+        """여러 수강신청을 한 트랜잭션으로 취소"""
+        if not enrollment_ids:
+            return 0
+
+        updated = self.db.query(Enrollment).filter(
+            Enrollment.id.in_(enrollment_ids)
+        ).update(
+            {'status': EnrollmentStatus.DROPPED, 'end_date': date.today()},
+            synchronize_session=False
+        )
+        self.db.commit()
+        return updated
 
     def unenroll(self, enrollment_id: int) -> bool:
         """수강 포기"""
-        enrollment = self.db.query(Enrollment).filter(Enrollment.id == enrollment_id).first()
+        enrollment = self.db.get(Enrollment, enrollment_id)
         if not enrollment:
             return False
         
@@ -181,8 +338,10 @@ class CourseService:
         return True
 
     def get_student_enrollments(self, student_id: int, active_only: bool = True) -> List[Enrollment]:
-        """학생의 수강 목록"""
-        query = self.db.query(Enrollment).filter(Enrollment.student_id == student_id)
+        """학생의 수강 목록 (course·subject 관계 포함 — N+1 lazy 로딩 방지)"""
+        query = self.db.query(Enrollment).options(
+            selectinload(Enrollment.course).selectinload(Course.subject)
+        ).filter(Enrollment.student_id == student_id)
         
         if active_only:
             query = query.filter(Enrollment.status == EnrollmentStatus.ACTIVE)
@@ -191,30 +350,90 @@ class CourseService:
 
     def get_course_enrollments(self, course_id: int, active_only: bool = True) -> List[Enrollment]:
         """수강과목의 수강생 목록"""
-        query = self.db.query(Enrollment).filter(Enrollment.course_id == course_id)
+        query = self.db.query(Enrollment).options(
+            selectinload(Enrollment.student)
+        ).filter(Enrollment.course_id == course_id)
         
         if active_only:
             query = query.filter(Enrollment.status == EnrollmentStatus.ACTIVE)
         
         return query.order_by(Enrollment.created_at).all()
 
-    def count_enrollments(self, course_id: int) -> int:
-        """수강과목의 현재 수강생 수"""
-        return self.db.query(Enrollment).filter(
+    def list_course_enrollments(self, course_id: int) -> List[Any]:
+        """수강생 배정 화면용 (enrollment_id, 학생명, 학원번호) 목록 — 조인 한 번"""
+        stmt = select(
+            Enrollment.id.label('enrollment_id'),
+            Student.name.label('student_name'),
+            Student.academy_id.label('academy_id')
+        ).join(Student, Enrollment.student_id == Student.id).where(
+            and_(
+                Enrollment.course_id == course_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE
+            )
+        ).order_by(Enrollment.created_at)
+
+        return self.db.execute(stmt).all()
+
+    def list_available_students(self, course_id: int) -> List[Any]:
+        """수강생 배정 화면용 미등록 학생 (id, 이름, 학원번호) 목록"""
+        already_enrolled = exists().where(
             and_(
+                Enrollment.student_id == Student.id,
                 Enrollment.course_id == course_id,
                 Enrollment.status == EnrollmentStatus.ACTIVE
             )
-        ).count()
+        )
+
+        stmt = select(
+            Student.id,
+            Student.name,
+            Student.academy_id
+        ).where(~already_enrolled).order_by(Student.name)
+
+        return self.db.execute(stmt).all()
+
+    def count_enrollments(self, course_id: int) -> int:
+        """수강과목의 현재 수강생 수
+
+        Query.count()는 서브쿼리로 감싼 SELECT를 내보내므로
+        평평한 SELECT count(*) 집계로 바로 실행한다.
+        """
+        return self.db.execute(_COUNT_ACTIVE_ENROLLMENTS, {'course_id': course_id}).scalar()
+
+    def get_enrollment_counts(self, course_ids: List[int]) -> Dict[int, int]:
+        """여러 수강과목의 수강생 수를 한 번에 조회 (course_id -> count)"""
+        if not course_ids:
+            return {}
+
+        rows = self.db.query(
+            Enrollment.course_id,
+            func.count(Enrollment.id)
+        ).filter(
+            and_(
+                Enrollment.course_id.in_(course_ids),
+                Enrollment.status == EnrollmentStatus.ACTIVE
+            )
+        ).group_by(Enrollment.course_id).all()
+
+        return {course_id: count for course_id, count in rows}
 
     def get_course_with_students(self, course_id: int) -> Optional[Dict[str, Any]]:
-        """수강과목과 수강생 정보 함께 조회"""
-        course = self.get_course(course_id)
+        """수강과목과 수강생 정보 함께 조회
+
+        ACTIVE 수강만 관계 경로(enrollments→student)로 한 번에 적재해
+        과목/수강생/학생을 각각 조회하던 왕복을 없앤다.
+        """
+        course = self.db.query(Course).options(
+            selectinload(
+                Course.enrollments.and_(Enrollment.status == EnrollmentStatus.ACTIVE)
+            ).selectinload(Enrollment.student)
+        ).filter(Course.id == course_id).first()
+
         if not course:
             return None
-        
-        enrollments = self.get_course_enrollments(course_id)
-        
+
+        enrollments = course.enrollments  # 이미 적재됨 — 추가 쿼리 없음
+
         return {
             'course': course,
             'enrollments': enrollments,
@@ -224,32 +443,58 @@ class CourseService:
 
     # ========== 통계 및 분석 ==========
     def get_course_statistics(self) -> Dict[str, Any]:
-        """수강과목 통계"""
-        total_courses = self.db.query(Course).count()
-        active_courses = self.db.query(Course).filter(Course.status == CourseStatus.ACTIVE).count()
-        total_subjects = self.db.query(Subject).filter(Subject.is_active == True).count()
-        total_enrollments = self.db.query(Enrollment).filter(Enrollment.status == EnrollmentStatus.ACTIVE).count()
-        
+        """수강과목 통계 (4개 COUNT를 스칼라 서브쿼리로 묶어 왕복 1회)"""
+        course_counts = select(
+            func.count(Course.id),
+            func.sum(case((Course.status == CourseStatus.ACTIVE, 1), else_=0))
+        ).subquery()
+
+        subject_count = select(func.count(Subject.id)).where(
+            Subject.is_active == True
+        ).scalar_subquery()
+
+        enrollment_count = select(func.count(Enrollment.id)).where(
+            Enrollment.status == EnrollmentStatus.ACTIVE
+        ).scalar_subquery()
+
+        total_courses, active_courses, total_subjects, total_enrollments = self.db.execute(
+            select(course_counts, subject_count, enrollment_count)
+        ).one()
+
         return {
-            'total_courses': total_courses,
-            'active_courses': active_courses,
-            'total_subjects': total_subjects,
-            'total_enrollments': total_enrollments
+            'total_courses': total_courses or 0,
+            'active_courses': int(active_courses or 0),
+            'total_subjects': total_subjects or 0,
+            'total_enrollments': total_enrollments or 0
         }
 
     def get_popular_courses(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """인기 수강과목 Top N"""
-        popular_courses = self.db.query(
-            Course.id,
-            Course.name,
-            Subject.name.label('subject_name'),
-            func.count(Enrollment.id).label('enrollment_count')
-        ).join(Subject).join(Enrollment).filter(
+        """인기 수강과목 Top N
+
+        수강신청 테이블을 (course_id, status) 인덱스로 먼저 집계해 Top N을
+        추린 뒤 과목 정보를 조인한다 — 무거운 GROUP BY가 조인 결과가 아닌
+        작은 인덱스 테이블 위에서 돈다.
+        """
+        counts = select(
+            Enrollment.course_id,
+            func.count().label('enrollment_count')
+        ).where(
             Enrollment.status == EnrollmentStatus.ACTIVE
-        ).group_by(Course.id, Course.name, Subject.name).order_by(
-            func.count(Enrollment.id).desc()
-        ).limit(limit).all()
-        
+        ).group_by(Enrollment.course_id).order_by(
+            func.count().desc()
+        ).limit(limit).subquery()
+
+        popular_courses = self.db.execute(
+            select(
+                Course.id,
+                Course.name,
+                Subject.name.label('subject_name'),
+                counts.c.enrollment_count
+            ).join(counts, counts.c.course_id == Course.id).join(Subject).order_by(
+                counts.c.enrollment_count.desc()
+            )
+        ).all()
+
         return [
             {
                 'course_id': course.id,
@@ -262,34 +507,36 @@ class CourseService:
 
     # ========== 검색 및 필터링 ==========
     def get_available_courses(self, student_id: int) -> List[Course]:
-        """학생이 수강 가능한 수강과목 검색 (이미 수강중이지 않은 과목)"""
-        enrolled_course_ids = self.db.query(Enrollment.course_id).filter(
+        """학생이 수강 가능한 수강과목 검색 (이미 수강중이지 않은 과목)
+
+        NOT IN 서브쿼리 대신 상관 NOT EXISTS 안티조인 사용 — NULL 의미론
+        함정이 없고 대형 테이블에서 플래너가 훨씬 잘 처리한다.
+        """
+        already_enrolled = exists().where(
             and_(
+                Enrollment.course_id == Course.id,
                 Enrollment.student_id == student_id,
                 Enrollment.status == EnrollmentStatus.ACTIVE
             )
-        ).subquery()
-        
-        available_courses = self.db.query(Course).filter(
+        )
+
+        return self.db.query(Course).filter(
             and_(
                 Course.status == CourseStatus.ACTIVE,
-                ~Course.id.in_(enrolled_course_ids)
+                ~already_enrolled
             )
         ).order_by(Course.name).all()
-        
-        return available_courses
 
     def get_available_students(self, course_id: int) -> List[Student]:
-        """특정 수강과목에 등록되지 않은 학생 목록"""
-        enrolled_student_ids = self.db.query(Enrollment.student_id).filter(
+        """특정 수강과목에 등록되지 않은 학생 목록 (NOT EXISTS 안티조인)"""
+        already_enrolled = exists().where(
             and_(
+                Enrollment.student_id == Student.id,
                 Enrollment.course_id == course_id,
                 Enrollment.status == EnrollmentStatus.ACTIVE
             )
-        ).subquery()
-        
-        available_students = self.db.query(Student).filter(
-            ~Student.id.in_(enrolled_student_ids)
-        ).order_by(Student.name).all()
-        
-        return available_students
\ No newline at end of file
+        )
+
+        return self.db.query(Student).filter(
+            ~already_enrolled
+        ).order_by(Student.name).all()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert, event, text
 from sqlalchemy.orm import sessionmaker
 from src.models.database import Base
 from src.utils.config import get_database_url
@@ -11,27 +11,66 @@ SessionLocal = None
 def init_database():
     """데이터베이스 초기화"""
     global engine, SessionLocal
-    
+
+    # Streamlit은 위젯 상호작용마다 스크립트를 재실행하므로
+    # 엔진/풀은 프로세스당 한 번만 생성한다
+    if engine is not None:
+        return
+
     try:
         # 데이터베이스 디렉토리 생성
         os.makedirs("database", exist_ok=True)
-        
+
         # 데이터베이스 URL 가져오기
         database_url = get_database_url()
-        
-        # 엔진 생성
+
+        # 엔진 생성 (커넥션 풀 재사용)
+        # SQLite 커넥션은 기본적으로 생성 스레드에서만 쓸 수 있는데,
+        # 풀은 스레드 간에 커넥션을 공유하므로 check_same_thread를 푼다
+        connect_args = {}
+        if database_url.startswith("sqlite"):
+            connect_args["check_same_thread"] = False
+
         engine = create_engine(
             database_url,
             echo=False,  # SQL 로그 출력 여부
-            pool_pre_ping=True
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20,
+            pool_recycle=3600,
+            pool_timeout=30,
+            connect_args=connect_args
         )
+
+        if engine.dialect.name == "sqlite":
+            # WAL + NORMAL: 쓰기 중에도 읽기가 막히지 않고 커밋마다
+            # fsync하지 않아 enroll/unenroll처럼 매 호출 커밋하는 경로가
+            # 훨씬 빨라진다. 나머지는 임시 테이블/페이지 캐시 메모리 설정.
+            @event.listens_for(engine, "connect")
+            def _set_sqlite_pragma(dbapi_conn, _connection_record):
+                cursor = dbapi_conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("PRAGMA cache_size=-65536")
+                cursor.close()
         
-        # 세션 팩토리 생성
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        # 세션 팩토리 생성 (모듈 전역이라 Streamlit rerun 간에도 유지됨 —
+        # st.cache_resource와 같은 역할. expire_on_commit=False로
+        # 세션 종료 후에도 읽어둔 ORM 인스턴스 속성을 그대로 쓸 수 있다)
+        SessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=engine
+        )
         
         # 테이블 생성
         Base.metadata.create_all(bind=engine)
-        
+
+        # 기존 DB 스키마 보정 (create_all은 기존 테이블에 컬럼을 추가하지 않음)
+        _apply_schema_upgrades()
+
         # 초기 데이터 생성
         create_initial_data()
         
@@ -41,6 +80,83 @@ def init_database():
         print(f"❌ 데이터베이스 초기화 실패: {e}")
         raise
 
+def _apply_schema_upgrades():
+    """기존 SQLite 파일에 누락된 컬럼/인덱스 추가 (마이그레이션 도구 없이 최소한으로)"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(guardians)")}
+        if "phone_normalized" not in columns:
+            conn.exec_driver_sql(
+                "ALTER TABLE guardians ADD COLUMN phone_normalized VARCHAR(20)"
+            )
+            # 기존 데이터 백필 (하이픈/공백 제거 — 입력 형식이 010-0000-0000 고정이라 충분)
+            conn.exec_driver_sql(
+                "UPDATE guardians SET phone_normalized = "
+                "replace(replace(phone, '-', ''), ' ', '')"
+            )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_guardians_phone_normalized "
+            "ON guardians (phone_normalized)"
+        )
+        if "search_blob" not in columns:
+            conn.exec_driver_sql(
+                "ALTER TABLE guardians ADD COLUMN search_blob TEXT"
+            )
+            conn.exec_driver_sql(
+                "UPDATE guardians SET search_blob = lower("
+                "coalesce(name,'') || ' ' || coalesce(phone,'') || ' ' || "
+                "coalesce(email,'') || ' ' || coalesce(workplace,''))"
+            )
+        # 모델에는 선언돼 있지만 기존 테이블에는 빠져 있을 수 있는 인덱스
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_students_enrollment_date "
+            "ON students (enrollment_date)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_students_name ON students (name)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_guardians_name ON guardians (name)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_students_status ON students (status)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_courses_subject_id ON courses (subject_id)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_courses_status ON courses (status)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_enrollments_student_id "
+            "ON enrollments (student_id)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_enrollments_course_id "
+            "ON enrollments (course_id)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_enrollments_course_status "
+            "ON enrollments (course_id, status)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_enrollments_student_status "
+            "ON enrollments (student_id, status)"
+        )
+        try:
+            # ACTIVE 행에만 적용되는 부분 유니크 인덱스 — 기존 데이터에
+            # 중복 수강이 이미 있으면 생성이 실패하므로 그 경우에만
+            # 경고하고 넘어간다 (제약 없이도 나머지 업그레이드는 유효)
+            conn.exec_driver_sql(
+                "CREATE UNIQUE INDEX IF NOT EXISTS "
+                "uq_enrollments_active_student_course "
+                "ON enrollments (student_id, course_id) WHERE status = 'ACTIVE'"
+            )
+        except Exception as e:
+            print(f"⚠️ 중복 수강 방지 인덱스 생성 실패 (기존 중복 데이터 정리 필요): {e}")
+
 def get_db():
     """데이터베이스 세션 가져오기"""
     db = SessionLocal()
@@ -50,7 +166,11 @@ def get_db():
         db.close()
 
 def get_db_session():
-    """데이터베이스 세션 가져오기 (단일 세션)"""
+    """데이터베이스 세션 가져오기 (단일 세션)
+
+    세션 생성 자체는 가볍고, 실제 커넥션은 첫 쿼리 시 풀(QueuePool)에서
+    빌려 close() 때 반납하므로 rerun마다 호출해도 핸드셰이크 비용이 없다.
+    """
     return SessionLocal()
 
 def create_initial_data():
@@ -85,12 +205,17 @@ def create_initial_data():
             {"name": "코딩", "description": "프로그래밍 과목"}
         ]
         
-        for subject_data in subjects_data:
-            existing_subject = db.query(Subject).filter(Subject.name == subject_data["name"]).first()
-            if not existing_subject:
-                subject = Subject(**subject_data)
-                db.add(subject)
-        
+        # 과목명 존재 여부를 한 쿼리로 확인 후 누락분만 executemany로 일괄 삽입
+        # (과목당 SELECT+INSERT 왕복 제거 — 매 시작마다 실행되는 경로)
+        existing_names = {
+            name for (name,) in db.query(Subject.name).filter(
+                Subject.name.in_([s["name"] for s in subjects_data])
+            ).all()
+        }
+        missing = [s for s in subjects_data if s["name"] not in existing_names]
+        if missing:
+            db.execute(insert(Subject), missing)
+
         db.commit()
         print("✅ 초기 데이터 생성 완료")
         
@@ -111,13 +236,16 @@ def reset_database():
         create_initial_data()
         print("✅ 데이터베이스 리셋 완료")
 
+# 연결 테스트용 ping 구문 (모듈 로드 시 한 번만 컴파일)
+_PING = text("SELECT 1")
+
 # 데이터베이스 연결 테스트
 def test_connection():
     """데이터베이스 연결 테스트"""
     try:
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
+        # 세션(identity map) 생성 없이 풀에서 커넥션만 빌려 ping
+        with engine.connect() as conn:
+            conn.execute(_PING)
         return True
     except Exception as e:
         print(f"❌ 데이터베이스 연결 실패: {e}")
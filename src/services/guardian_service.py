@@ -1,10 +1,47 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy.orm import Session, aliased, selectinload
+from sqlalchemy import and_, func, case, select, insert, delete, exists, literal
 from src.models.database import Guardian, Student, StudentGuardian, RelationshipType
 from datetime import datetime
 from typing import List, Optional, Dict
 import pandas as pd
 
+# 엑셀 '관계' 컬럼 → enum 매핑 (호출마다 재생성하지 않도록 모듈 상수로)
+_RELATIONSHIP_BY_LABEL = {
+    '아버지': RelationshipType.FATHER,
+    '어머니': RelationshipType.MOTHER,
+    '할아버지': RelationshipType.GRANDFATHER,
+    '할머니': RelationshipType.GRANDMOTHER,
+    '삼촌': RelationshipType.UNCLE,
+    '이모': RelationshipType.AUNT,
+    '보호자': RelationshipType.GUARDIAN,
+    '기타': RelationshipType.OTHER
+}
+
+def _normalize_phone(phone) -> str:
+    """전화번호에서 숫자만 추출 (phone_normalized 컬럼용)"""
+    return ''.join(filter(str.isdigit, str(phone or '')))
+
+# search_blob에 들어가는 검색 대상 필드 (get_all의 텍스트 검색 범위와 일치)
+_SEARCH_BLOB_FIELDS = ('name', 'phone', 'email', 'workplace')
+
+def _build_search_blob(guardian: Guardian) -> str:
+    """이름/전화/이메일/직장을 이어붙인 소문자 검색 블롭"""
+    return ' '.join(
+        str(getattr(guardian, field) or '') for field in _SEARCH_BLOB_FIELDS
+    ).lower()
+
+def new_guardian(guardian_info: dict) -> Guardian:
+    """파생 검색 컬럼까지 채운 Guardian 객체 생성
+
+    보호자를 세션에 추가하는 모든 경로(단건 생성, 학생 등록 폼)는
+    이 팩토리를 거쳐야 phone_normalized/search_blob이 실제 값과
+    어긋나지 않는다.
+    """
+    guardian = Guardian(**guardian_info)
+    guardian.phone_normalized = _normalize_phone(guardian.phone)
+    guardian.search_blob = _build_search_blob(guardian)
+    return guardian
+
 class GuardianService:
     def __init__(self, db: Session):
         self.db = db
@@ -12,12 +49,12 @@ class GuardianService:
     def create(self, guardian_info: dict) -> Guardian:
         """보호자 생성"""
         try:
-            new_guardian = Guardian(**guardian_info)
-            self.db.add(new_guardian)
+            guardian = new_guardian(guardian_info)
+            self.db.add(guardian)
+            # PK/기본값은 flush 시점에 채워지므로 refresh 재조회 생략
             self.db.commit()
-            self.db.refresh(new_guardian)
-            
-            return new_guardian
+
+            return guardian
             
         except Exception as e:
             self.db.rollback()
@@ -28,28 +65,43 @@ class GuardianService:
         return self.db.query(Guardian).filter(Guardian.id == guardian_id).first()
     
     def get_by_phone(self, phone: str) -> Optional[Guardian]:
-        """전화번호로 보호자 조회"""
-        # 숫자만 추출하여 검색
-        clean_phone = ''.join(filter(str.isdigit, phone))
+        """전화번호로 보호자 조회
+
+        LIKE '%…%'는 인덱스를 타지 못해 매번 풀스캔이었으므로
+        정규화 컬럼(phone_normalized)에 대한 인덱스 동등 조회로 대체.
+        """
+        clean_phone = _normalize_phone(phone)
+        if not clean_phone:
+            return None
         return self.db.query(Guardian).filter(
-            Guardian.phone.like(f"%{clean_phone}%")
+            Guardian.phone_normalized == clean_phone
         ).first()
     
-    def get_all(self, search: str = None, limit: int = None) -> List[Guardian]:
-        """모든 보호자 조회"""
+    def get_all(self, search: str = None, limit: int = None,
+                with_students: bool = False) -> List[Guardian]:
+        """모든 보호자 조회
+
+        관계는 lazy="raise"라 우발적인 N+1이 바로 드러난다. 자녀 목록까지
+        쓰는 호출자는 with_students=True로 selectinload를 명시할 것.
+        """
         query = self.db.query(Guardian)
-        
+
+        if with_students:
+            query = query.options(selectinload(Guardian.students))
+
         # 검색 필터
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Guardian.name.ilike(search_term),
-                    Guardian.phone.ilike(search_term),
-                    Guardian.email.ilike(search_term),
-                    Guardian.workplace.ilike(search_term)
+            digits = search.replace('-', '').replace(' ', '')
+            if digits.isdigit():
+                # 숫자 검색은 네 컬럼 ilike 풀스캔 대신
+                # 인덱스를 타는 정규화 전화번호 전방일치로 처리
+                query = query.filter(Guardian.phone_normalized.startswith(digits))
+            else:
+                # 컬럼 4개에 각각 ilike를 거는 대신 미리 이어붙여 둔
+                # 소문자 블롭에 LIKE 한 번 — 행당 패턴 평가가 1회로 줄어든다
+                query = query.filter(
+                    Guardian.search_blob.like(f"%{search.lower()}%")
                 )
-            )
         
         # 정렬
         query = query.order_by(Guardian.name)
@@ -60,6 +112,10 @@ class GuardianService:
         
         return query.all()
     
+    def count_all(self) -> int:
+        """전체 보호자 수"""
+        return self.db.query(func.count(Guardian.id)).scalar() or 0
+
     def update(self, guardian_id: int, update_data: dict) -> Guardian:
         """보호자 정보 수정"""
         try:
@@ -71,7 +127,12 @@ class GuardianService:
             for key, value in update_data.items():
                 if hasattr(guardian, key):
                     setattr(guardian, key, value)
-            
+
+            if 'phone' in update_data:
+                guardian.phone_normalized = _normalize_phone(guardian.phone)
+            if any(field in update_data for field in _SEARCH_BLOB_FIELDS):
+                guardian.search_blob = _build_search_blob(guardian)
+
             guardian.updated_at = datetime.utcnow()
             self.db.commit()
             self.db.refresh(guardian)
@@ -107,11 +168,67 @@ class GuardianService:
             raise Exception(f"보호자 삭제 실패: {str(e)}")
     
     def get_by_student(self, student_id: int) -> List[Guardian]:
-        """학생의 보호자 목록 조회"""
+        """학생의 보호자 목록 조회 (주보호자가 항상 첫 번째)"""
         return self.db.query(Guardian).join(StudentGuardian).filter(
             StudentGuardian.student_id == student_id
+        ).order_by(Guardian.is_primary.desc(), Guardian.id).all()
+
+    def get_guardians_for_students(self, student_ids: List[int]) -> Dict[int, List[Guardian]]:
+        """여러 학생의 보호자를 한 쿼리로 조회 (student_id -> 보호자 목록)
+
+        is_primary DESC 정렬이므로 각 목록의 첫 원소가 주보호자다.
+        """
+        if not student_ids:
+            return {}
+
+        rows = self.db.query(StudentGuardian.student_id, Guardian).join(
+            Guardian, StudentGuardian.guardian_id == Guardian.id
+        ).filter(StudentGuardian.student_id.in_(student_ids)).order_by(
+            Guardian.is_primary.desc(), Guardian.id
         ).all()
-    
+
+        guardians_map = {}
+        for student_id, guardian in rows:
+            guardians_map.setdefault(student_id, []).append(guardian)
+
+        return guardians_map
+
+    def get_guardian_summary_for_students(self, student_ids: List[int]) -> Dict[int, tuple]:
+        """학생별 보호자 표시용 요약을 SQL 집계로 생성
+
+        student_id -> (이름 목록 문자열, 총원, 주보호자 연락처).
+        목록 화면은 이름/연락처 문자열만 쓰므로 보호자 전체 행을
+        로딩하지 않고 GROUP_CONCAT으로 서버에서 합쳐 받는다.
+        (SQLite라 STRING_AGG의 ORDER BY 절 대신 정렬된 서브쿼리 사용)
+        """
+        if not student_ids:
+            return {}
+
+        ordered = self.db.query(
+            StudentGuardian.student_id.label('student_id'),
+            Guardian.name.label('name'),
+            Guardian.is_primary.label('is_primary'),
+            Guardian.phone.label('phone')
+        ).join(
+            Guardian, StudentGuardian.guardian_id == Guardian.id
+        ).filter(
+            StudentGuardian.student_id.in_(student_ids)
+        ).order_by(
+            StudentGuardian.student_id, Guardian.is_primary.desc(), Guardian.id
+        ).subquery()
+
+        rows = self.db.query(
+            ordered.c.student_id,
+            func.group_concat(ordered.c.name, ', '),
+            func.count(),
+            func.max(case((ordered.c.is_primary == True, ordered.c.phone)))
+        ).group_by(ordered.c.student_id).all()
+
+        return {
+            student_id: (names or '', count, primary_phone or '')
+            for student_id, names, count, primary_phone in rows
+        }
+
     def get_students(self, guardian_id: int) -> List[Student]:
         """보호자의 자녀 목록 조회"""
         return self.db.query(Student).join(StudentGuardian).filter(
@@ -145,121 +262,195 @@ class GuardianService:
             self.db.rollback()
             raise Exception(f"보호자-학생 연결 실패: {str(e)}")
     
+    def link_students(self, guardian_id: int, student_ids: List[int]) -> int:
+        """한 보호자에게 여러 학생을 일괄 연결
+
+        쌍마다 link_student(SELECT+INSERT+커밋)를 부르는 대신 기존 연결을
+        IN 쿼리 한 번으로 걸러내고 나머지를 executemany로 한 번에 삽입한다.
+        연결된 학생 수를 반환.
+        """
+        if not student_ids:
+            return 0
+
+        try:
+            existing = {
+                student_id for (student_id,) in self.db.query(
+                    StudentGuardian.student_id
+                ).filter(
+                    StudentGuardian.guardian_id == guardian_id,
+                    StudentGuardian.student_id.in_(student_ids)
+                ).all()
+            }
+            new_student_ids = [s for s in student_ids if s not in existing]
+            if not new_student_ids:
+                return 0
+
+            self.db.execute(
+                insert(StudentGuardian),
+                [
+                    {'student_id': student_id, 'guardian_id': guardian_id}
+                    for student_id in new_student_ids
+                ]
+            )
+            self.db.commit()
+
+            return len(new_student_ids)
+
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"보호자-학생 일괄 연결 실패: {str(e)}")
+
     def unlink_student(self, guardian_id: int, student_id: int) -> bool:
-        """보호자와 학생 연결 해제"""
+        """보호자와 학생 연결 해제 (조회 없이 DELETE 한 문장)"""
         try:
-            student_guardian = self.db.query(StudentGuardian).filter(
+            deleted = self.db.query(StudentGuardian).filter(
                 StudentGuardian.guardian_id == guardian_id,
                 StudentGuardian.student_id == student_id
-            ).first()
-            
-            if student_guardian:
-                self.db.delete(student_guardian)
-                self.db.commit()
-                return True
-            
-            return False
-            
+            ).delete(synchronize_session=False)
+            self.db.commit()
+
+            return bool(deleted)
+
         except Exception as e:
             self.db.rollback()
             raise Exception(f"보호자-학생 연결 해제 실패: {str(e)}")
     
     def find_duplicates(self) -> List[Dict]:
-        """중복 보호자 찾기 (전화번호 기준)"""
-        # 전화번호별 보호자 수 집계
-        phone_counts = self.db.query(
-            Guardian.phone,
-            func.count(Guardian.id).label('count'),
-            func.group_concat(Guardian.id).label('ids'),
-            func.group_concat(Guardian.name).label('names')
-        ).group_by(Guardian.phone).having(func.count(Guardian.id) > 1).all()
-        
-        duplicates = []
-        for phone, count, ids, names in phone_counts:
-            if phone:  # 전화번호가 있는 경우만
-                duplicates.append({
-                    'phone': phone,
-                    'count': count,
-                    'guardian_ids': [int(id) for id in ids.split(',')],
-                    'names': names.split(',')
-                })
-        
-        return duplicates
+        """중복 보호자 찾기 (정규화 전화번호 기준)
+
+        group_concat 문자열을 쉼표로 쪼개 int 캐스팅하던 방식은 이름에
+        쉼표가 들어가면 깨진다. SQLite에는 array_agg가 없으므로 중복 번호를
+        먼저 집계한 뒤 해당 보호자 행만 한 번 더 조회해 군집을 만든다.
+        표기(하이픈 유무)가 달라도 phone_normalized로 같은 번호를 잡는다.
+        """
+        dup_counts = dict(
+            self.db.query(
+                Guardian.phone_normalized,
+                func.count(Guardian.id)
+            ).filter(
+                Guardian.phone_normalized.isnot(None),
+                Guardian.phone_normalized != ''
+            ).group_by(Guardian.phone_normalized).having(func.count(Guardian.id) > 1).all()
+        )
+
+        if not dup_counts:
+            return []
+
+        rows = self.db.query(
+            Guardian.phone_normalized, Guardian.id, Guardian.name, Guardian.phone
+        ).filter(
+            Guardian.phone_normalized.in_(dup_counts)
+        ).order_by(Guardian.phone_normalized, Guardian.id).all()
+
+        clusters = {}
+        for normalized, guardian_id, name, phone in rows:
+            cluster = clusters.setdefault(normalized, {
+                'phone': phone,
+                'count': dup_counts[normalized],
+                'guardian_ids': [],
+                'names': []
+            })
+            cluster['guardian_ids'].append(guardian_id)
+            cluster['names'].append(name)
+
+        return list(clusters.values())
     
     def merge(self, primary_guardian_id: int, duplicate_guardian_ids: List[int]) -> bool:
-        """중복 보호자 병합"""
+        """중복 보호자 병합
+
+        중복당 관계 행을 하나씩 옮기던 루프 대신 집합 연산 3문장으로 처리:
+        관계 이전(INSERT ... SELECT) → 중복 관계 삭제 → 중복 보호자 삭제.
+        """
         try:
-            primary_guardian = self.get_guardian_by_id(primary_guardian_id)
+            primary_guardian = self.get_by_id(primary_guardian_id)
             if not primary_guardian:
                 raise Exception("기본 보호자를 찾을 수 없습니다.")
-            
-            for duplicate_id in duplicate_guardian_ids:
-                if duplicate_id == primary_guardian_id:
-                    continue
-                
-                # 중복 보호자의 학생 관계를 기본 보호자로 이전
-                duplicate_relationships = self.db.query(StudentGuardian).filter(
-                    StudentGuardian.guardian_id == duplicate_id
-                ).all()
-                
-                for relationship in duplicate_relationships:
-                    # 기본 보호자와 학생의 관계가 이미 있는지 확인
-                    existing = self.db.query(StudentGuardian).filter(
-                        StudentGuardian.student_id == relationship.student_id,
-                        StudentGuardian.guardian_id == primary_guardian_id
-                    ).first()
-                    
-                    if not existing:
-                        # 새로운 관계 생성
-                        new_relationship = StudentGuardian(
-                            student_id=relationship.student_id,
-                            guardian_id=primary_guardian_id
+
+            dup_ids = [g for g in duplicate_guardian_ids if g != primary_guardian_id]
+            if not dup_ids:
+                return True
+
+            # 중복 보호자의 학생 관계를 기본 보호자 앞으로 일괄 이전.
+            # 이미 기본 보호자와 연결된 학생은 NOT EXISTS로 건너뛰고,
+            # 여러 중복이 같은 학생을 가리키는 경우는 DISTINCT로 한 행만 남긴다
+            # (UPDATE 방식은 (student_id, guardian_id) PK 충돌 위험이 있어 INSERT ... SELECT 사용)
+            sg_cols = StudentGuardian.__table__.c
+            sg2 = aliased(StudentGuardian)
+            transferable = select(
+                StudentGuardian.student_id,
+                literal(primary_guardian_id, type_=sg_cols.guardian_id.type),
+                literal(datetime.utcnow(), type_=sg_cols.created_at.type)
+            ).where(
+                and_(
+                    StudentGuardian.guardian_id.in_(dup_ids),
+                    ~exists().where(
+                        and_(
+                            sg2.student_id == StudentGuardian.student_id,
+                            sg2.guardian_id == primary_guardian_id
                         )
-                        self.db.add(new_relationship)
-                    
-                    # 기존 관계 삭제
-                    self.db.delete(relationship)
-                
-                # 중복 보호자 삭제
-                duplicate_guardian = self.get_guardian_by_id(duplicate_id)
-                if duplicate_guardian:
-                    self.db.delete(duplicate_guardian)
-            
+                    )
+                )
+            ).distinct()
+
+            self.db.execute(
+                insert(StudentGuardian).from_select(
+                    ['student_id', 'guardian_id', 'created_at'], transferable
+                )
+            )
+            self.db.execute(
+                delete(StudentGuardian).where(StudentGuardian.guardian_id.in_(dup_ids))
+            )
+            self.db.execute(delete(Guardian).where(Guardian.id.in_(dup_ids)))
+
             self.db.commit()
             return True
-            
+
         except Exception as e:
             self.db.rollback()
             raise Exception(f"보호자 병합 실패: {str(e)}")
     
     def get_statistics(self) -> dict:
         """보호자 통계"""
-        total_guardians = self.db.query(Guardian).count()
-        
+        # 전체 수 + 연락처 설정 4종을 SUM(CASE)로 묶어 한 번의 스캔으로 집계
+        # (COUNT 쿼리 5회 왕복 → 1회)
+        totals = self.db.query(
+            func.count(Guardian.id),
+            func.sum(case((Guardian.sms_enabled == True, 1), else_=0)),
+            func.sum(case((Guardian.email_enabled == True, 1), else_=0)),
+            func.sum(case((Guardian.kakao_enabled == True, 1), else_=0)),
+            func.sum(case((Guardian.phone_enabled == True, 1), else_=0)),
+        ).one()
+        total_guardians = totals[0]
+
+        communication_stats = {
+            'sms_enabled': totals[1] or 0,
+            'email_enabled': totals[2] or 0,
+            'kakao_enabled': totals[3] or 0,
+            'phone_enabled': totals[4] or 0,
+        }
+
         # 관계별 통계
         relationship_stats = self.db.query(
             Guardian.relationship_type,
             func.count(Guardian.id)
         ).group_by(Guardian.relationship_type).all()
         
-        # 연락처 설정 통계
-        communication_stats = {
-            'sms_enabled': self.db.query(Guardian).filter(Guardian.sms_enabled == True).count(),
-            'email_enabled': self.db.query(Guardian).filter(Guardian.email_enabled == True).count(),
-            'kakao_enabled': self.db.query(Guardian).filter(Guardian.kakao_enabled == True).count(),
-            'phone_enabled': self.db.query(Guardian).filter(Guardian.phone_enabled == True).count(),
-        }
-        
-        # 자녀 수별 통계
+        # 자녀 수별 통계 — 보호자별 자녀 수를 서브쿼리로 집계한 뒤
+        # 그 결과를 다시 GROUP BY해서 히스토그램까지 DB에서 만든다
+        # (보호자 수만큼 행을 받아 파이썬에서 합산하던 것을 버킷 수 행으로 축소)
+        per_guardian = self.db.query(
+            func.count(StudentGuardian.student_id).label('children_count')
+        ).select_from(Guardian).outerjoin(StudentGuardian).group_by(Guardian.id).subquery()
+
         children_stats = self.db.query(
-            func.count(StudentGuardian.student_id).label('children_count'),
-            func.count(Guardian.id).label('guardian_count')
-        ).select_from(Guardian).outerjoin(StudentGuardian).group_by(Guardian.id).all()
-        
-        children_distribution = {}
-        for children_count, guardian_count in children_stats:
-            key = f"{children_count}명" if children_count > 0 else "0명"
-            children_distribution[key] = children_distribution.get(key, 0) + guardian_count
+            per_guardian.c.children_count,
+            func.count()
+        ).group_by(per_guardian.c.children_count).all()
+
+        children_distribution = {
+            f"{children_count}명": guardian_count
+            for children_count, guardian_count in children_stats
+        }
         
         return {
             'total_guardians': total_guardians,
@@ -271,97 +462,116 @@ class GuardianService:
             'children_distribution': children_distribution
         }
     
-    def import_from_excel(self, file_path: str) -> dict:
-        """엑셀 파일에서 보호자 데이터 가져오기"""
+    def import_from_excel(self, file_source) -> dict:
+        """엑셀 파일에서 보호자 데이터 가져오기
+
+        file_source는 파일 경로 또는 BytesIO 같은 파일류 객체.
+        행마다 create()(커밋+fsync)를 호출하던 방식 대신 pandas로 일괄
+        정제한 뒤 bulk_insert_mappings 한 번 + 단일 커밋으로 적재한다.
+        """
         try:
-            df = pd.read_excel(file_path)
-            
-            success_count = 0
-            error_count = 0
-            errors = []
-            
-            # 관계 매핑
-            relationship_mapping = {
-                '아버지': RelationshipType.FATHER,
-                '어머니': RelationshipType.MOTHER,
-                '할아버지': RelationshipType.GRANDFATHER,
-                '할머니': RelationshipType.GRANDMOTHER,
-                '삼촌': RelationshipType.UNCLE,
-                '이모': RelationshipType.AUNT,
-                '보호자': RelationshipType.GUARDIAN,
-                '기타': RelationshipType.OTHER
-            }
-            
-            for index, row in df.iterrows():
-                try:
-                    guardian_data = {
-                        'name': row.get('이름'),
-                        'relationship': relationship_mapping.get(row.get('관계'), RelationshipType.OTHER),
-                        'phone': str(row.get('연락처', '')),
-                        'email': row.get('이메일'),
-                        'occupation': row.get('직업'),
-                        'workplace': row.get('직장'),
-                        'work_phone': str(row.get('직장전화', '')),
-                        'postal_code': str(row.get('우편번호', '')),
-                        'road_address': row.get('주소'),
-                        'detail_address': row.get('상세주소'),
-                        'is_primary': row.get('주보호자') == 'Y',
-                    }
-                    
-                    # 필수 필드 검증
-                    if not guardian_data['name']:
-                        raise ValueError("이름은 필수입니다.")
-                    if not guardian_data['phone']:
-                        raise ValueError("연락처는 필수입니다.")
-                    
-                    self.create(guardian_data)
-                    success_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f"행 {index + 2}: {str(e)}")
-            
+            expected_columns = [
+                '이름', '관계', '연락처', '이메일', '직업', '직장',
+                '직장전화', '우편번호', '주소', '상세주소', '주보호자'
+            ]
+            # 필요한 컬럼만 파싱하고 전화/우편번호류는 바로 문자열로 읽는다
+            # (여분 컬럼의 셀 변환 비용과 이후 astype 재변환 제거)
+            expected_set = set(expected_columns)
+            df = pd.read_excel(
+                file_source,
+                usecols=lambda name: name in expected_set,
+                dtype={'연락처': str, '직장전화': str, '우편번호': str}
+            ).reindex(columns=expected_columns)
+
+            # 필수 필드 검증 (마스크 연산 — 행 단위 예외 처리 제거)
+            valid_mask = df['이름'].notna() & df['연락처'].notna()
+            errors = [
+                f"행 {index + 2}: 이름과 연락처는 필수입니다."
+                for index in df.index[~valid_mask]
+            ]
+
+            valid = df[valid_mask]
+            records = []
+            if not valid.empty:
+                phone = valid['연락처'].astype('string')
+                out = pd.DataFrame({
+                    'name': valid['이름'],
+                    'relationship_type': valid['관계'].map(_RELATIONSHIP_BY_LABEL).fillna(RelationshipType.OTHER),
+                    'phone': phone,
+                    'phone_normalized': phone.str.replace(r'\D', '', regex=True),
+                    'search_blob': (
+                        valid['이름'].astype('string').fillna('') + ' '
+                        + phone.fillna('') + ' '
+                        + valid['이메일'].astype('string').fillna('') + ' '
+                        + valid['직장'].astype('string').fillna('')
+                    ).str.lower(),
+                    'email': valid['이메일'],
+                    'occupation': valid['직업'],
+                    'workplace': valid['직장'],
+                    'work_phone': valid['직장전화'].astype('string'),
+                    'postal_code': valid['우편번호'].astype('string'),
+                    'road_address': valid['주소'],
+                    'detail_address': valid['상세주소'],
+                    'is_primary': valid['주보호자'] == 'Y',
+                })
+                # NaN/NA는 DB에 NULL로 들어가도록 None으로 치환
+                records = out.where(pd.notna(out), None).to_dict('records')
+
+                self.db.bulk_insert_mappings(Guardian, records)
+                self.db.commit()
+
             return {
-                'success_count': success_count,
-                'error_count': error_count,
+                'success_count': len(records),
+                'error_count': len(errors),
                 'errors': errors
             }
-            
+
         except Exception as e:
+            self.db.rollback()
             raise Exception(f"엑셀 파일 처리 실패: {str(e)}")
     
     def export_to_excel(self, file_path: str, guardians: List[Guardian] = None) -> str:
-        """보호자 데이터를 엑셀로 내보내기"""
+        """보호자 데이터를 엑셀로 내보내기
+
+        ORM 객체를 행마다 딕셔너리로 풀지 않고 필요한 컬럼만 튜플로 조회해
+        DataFrame에 바로 싣고, 포맷 변환은 pandas 벡터 연산으로 처리한다.
+        """
         try:
-            if guardians is None:
-                guardians = self.get_all()
-            
-            data = []
-            for guardian in guardians:
-                data.append({
-                    'ID': guardian.id,
-                    '이름': guardian.name,
-                    '관계': guardian.relationship_type.value,
-                    '연락처': guardian.phone,
-                    '이메일': guardian.email or '',
-                    '직업': guardian.occupation or '',
-                    '직장': guardian.workplace or '',
-                    '직장전화': guardian.work_phone or '',
-                    '우편번호': guardian.postal_code or '',
-                    '주소': guardian.road_address or '',
-                    '상세주소': guardian.detail_address or '',
-                    '주보호자': 'Y' if guardian.is_primary else 'N',
-                    'SMS수신': 'Y' if guardian.sms_enabled else 'N',
-                    '이메일수신': 'Y' if guardian.email_enabled else 'N',
-                    '카카오톡수신': 'Y' if guardian.kakao_enabled else 'N',
-                    '전화수신': 'Y' if guardian.phone_enabled else 'N',
-                    '등록일': guardian.created_at.strftime('%Y-%m-%d %H:%M')
-                })
-            
-            df = pd.DataFrame(data)
-            df.to_excel(file_path, index=False, engine='openpyxl')
-            
+            query = self.db.query(
+                Guardian.id, Guardian.name, Guardian.relationship_type,
+                Guardian.phone, Guardian.email, Guardian.occupation,
+                Guardian.workplace, Guardian.work_phone, Guardian.postal_code,
+                Guardian.road_address, Guardian.detail_address,
+                Guardian.is_primary, Guardian.sms_enabled, Guardian.email_enabled,
+                Guardian.kakao_enabled, Guardian.phone_enabled, Guardian.created_at
+            ).order_by(Guardian.name)
+            if guardians is not None:
+                query = query.filter(Guardian.id.in_([g.id for g in guardians]))
+
+            df = pd.DataFrame.from_records(query.all(), columns=[
+                'ID', '이름', '관계', '연락처', '이메일', '직업', '직장',
+                '직장전화', '우편번호', '주소', '상세주소', '주보호자',
+                'SMS수신', '이메일수신', '카카오톡수신', '전화수신', '등록일'
+            ])
+
+            if not df.empty:
+                df['관계'] = df['관계'].map({r: r.value for r in RelationshipType})
+                flag_columns = ['주보호자', 'SMS수신', '이메일수신', '카카오톡수신', '전화수신']
+                for column in flag_columns:
+                    df[column] = df[column].astype(bool).map({True: 'Y', False: 'N'})
+                df['등록일'] = pd.to_datetime(df['등록일']).dt.strftime('%Y-%m-%d %H:%M')
+                text_columns = ['이메일', '직업', '직장', '직장전화', '우편번호', '주소', '상세주소']
+                df[text_columns] = df[text_columns].astype(object).where(
+                    df[text_columns].notna(), ''
+                )
+
+            # xlsxwriter가 openpyxl보다 쓰기 전용 워크북 생성이 빠르다.
+            # (constant_memory 모드는 행 순서 쓰기를 강제하는데 to_excel은
+            # 컬럼 단위로 쓰므로 함께 쓰면 셀이 유실된다 — 사용 금지)
+            with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
+                df.to_excel(writer, index=False)
+
             return file_path
-            
+
         except Exception as e:
             raise Exception(f"엑셀 내보내기 실패: {str(e)}")
\ No newline at end of file
@@ -1,11 +1,19 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
-from src.models.database import Student, Guardian, StudentGuardian, Gender, StudentStatus
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, and_, func, case, insert, extract, exists
+from sqlalchemy.exc import IntegrityError
+from src.models.database import Student, StudentGuardian, Gender, StudentStatus, \
+    Enrollment, EnrollmentStatus
+from src.services.guardian_service import new_guardian
 from src.utils.security import generate_academy_id
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import List, Optional, Dict
+import openpyxl
 import pandas as pd
 
+# 문자열 상태값 → enum 해석 테이블 (요청마다 enum을 순회하지 않도록 import 시 1회 구성)
+_STATUS_BY_KEY = {s.value: s for s in StudentStatus}
+_STATUS_BY_KEY.update({s.name.lower(): s for s in StudentStatus})
+
 class StudentService:
     def __init__(self, db: Session):
         self.db = db
@@ -13,30 +21,89 @@ class StudentService:
     def create(self, student_info: dict) -> Student:
         """학생 생성"""
         try:
-            # 학원 등록번호 자동 생성
-            student_info['academy_id'] = self.generate_unique_academy_id()
-            
             # 생년월일 문자열을 date 객체로 변환
             if isinstance(student_info.get('birth_date'), str):
                 student_info['birth_date'] = datetime.strptime(student_info['birth_date'], '%Y-%m-%d').date()
-            
+
             # 입학일 처리
             if isinstance(student_info.get('enrollment_date'), str):
                 student_info['enrollment_date'] = datetime.strptime(student_info['enrollment_date'], '%Y-%m-%d').date()
             elif not student_info.get('enrollment_date'):
                 student_info['enrollment_date'] = date.today()
-            
-            new_student = Student(**student_info)
-            self.db.add(new_student)
-            self.db.commit()
-            self.db.refresh(new_student)
-            
-            return new_student
-            
+
+            # 학원 등록번호는 사전 SELECT 없이 유니크 제약에 맡기고
+            # 충돌 시에만 새 번호로 재시도 (커밋 1회가 성공 경로의 전부)
+            return self._commit_with_unique_academy_id(
+                lambda academy_id: self._add_student(dict(student_info, academy_id=academy_id))
+            )
+
         except Exception as e:
             self.db.rollback()
             raise Exception(f"학생 생성 실패: {str(e)}")
+
+    def _add_student(self, student_info: dict) -> Student:
+        """학생 객체를 만들어 세션에 추가 (커밋은 호출자 몫)"""
+        new_student = Student(**student_info)
+        self.db.add(new_student)
+        return new_student
+
+    def _commit_with_unique_academy_id(self, build, retries: int = 5) -> Student:
+        """academy_id를 채워 build(academy_id)를 커밋하되 중복이면 재시도
+
+        생성 때마다 사전 SELECT로 중복을 확인하던 방식 대신 DB 유니크
+        제약에 맡긴다 — 성공 경로의 왕복이 하나 줄고 확인-삽입 사이의
+        경쟁 조건도 사라진다. 충돌(하루 65536가지 중 중복) 시에는 롤백
+        후 새 번호로 객체를 다시 만들어 커밋한다.
+        """
+        last_error = None
+        for _ in range(retries):
+            try:
+                student = build(generate_academy_id())
+                # PK/기본값은 flush 시점에 채워지므로 refresh 재조회 생략
+                self.db.commit()
+                return student
+            except IntegrityError as e:
+                self.db.rollback()
+                if 'academy_id' not in str(e.orig):
+                    raise
+                last_error = e
+        raise Exception(f"학원 등록번호 생성에 실패했습니다: {str(last_error)}")
     
+    def create_student_with_guardians(self, student_data: dict, guardian_list: List[dict]) -> Student:
+        """학생과 보호자들을 한 트랜잭션으로 등록
+
+        개별 create/link 호출(커밋 5회)을 add_all + flush + executemany
+        INSERT 1회 커밋으로 묶는다. 중간 실패 시 전체 롤백.
+        """
+        try:
+            student_data = dict(student_data)
+
+            if isinstance(student_data.get('birth_date'), str):
+                student_data['birth_date'] = datetime.strptime(student_data['birth_date'], '%Y-%m-%d').date()
+            if isinstance(student_data.get('enrollment_date'), str):
+                student_data['enrollment_date'] = datetime.strptime(student_data['enrollment_date'], '%Y-%m-%d').date()
+            elif not student_data.get('enrollment_date'):
+                student_data['enrollment_date'] = date.today()
+
+            def build(academy_id: str) -> Student:
+                student = self._add_student(dict(student_data, academy_id=academy_id))
+                guardians = [new_guardian(g) for g in guardian_list]
+                self.db.add_all(guardians)
+                self.db.flush()  # id 확보
+
+                if guardians:
+                    self.db.execute(
+                        insert(StudentGuardian),
+                        [{'student_id': student.id, 'guardian_id': g.id} for g in guardians]
+                    )
+                return student
+
+            return self._commit_with_unique_academy_id(build)
+
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"학생/보호자 등록 실패: {str(e)}")
+
     def get_by_id(self, student_id: int) -> Optional[Student]:
         """ID로 학생 조회"""
         return self.db.query(Student).filter(Student.id == student_id).first()
@@ -45,24 +112,32 @@ class StudentService:
         """학원 등록번호로 학생 조회"""
         return self.db.query(Student).filter(Student.academy_id == academy_id).first()
     
-    def get_all(self, status: str = None, search: str = None, limit: int = None) -> List[Student]:
-        """모든 학생 조회"""
+    def _filtered_query(self, status: str = None, search: str = None,
+                        course_id: int = None):
+        """상태/검색/수강과목 필터가 적용된 기본 쿼리 (목록·건수 조회 공용)"""
         query = self.db.query(Student)
-        
+
+        # 수강과목 필터 (해당 과목을 ACTIVE로 수강 중인 학생만) —
+        # 페이지네이션/건수 계산과 같은 쿼리에서 걸러야 페이지가 어긋나지 않는다
+        if course_id:
+            query = query.filter(
+                exists().where(and_(
+                    Enrollment.student_id == Student.id,
+                    Enrollment.course_id == course_id,
+                    Enrollment.status == EnrollmentStatus.ACTIVE
+                ))
+            )
+
         # 상태 필터
         if status:
-            # status가 문자열인 경우 해당하는 enum 찾기
+            # status가 문자열인 경우 해당하는 enum 찾기 (딕셔너리 1회 조회)
             if isinstance(status, str):
-                status_enum = None
-                for s in StudentStatus:
-                    if s.value == status or s.name.lower() == status.lower():
-                        status_enum = s
-                        break
+                status_enum = _STATUS_BY_KEY.get(status) or _STATUS_BY_KEY.get(status.lower())
                 if status_enum:
                     query = query.filter(Student.status == status_enum)
             else:
                 query = query.filter(Student.status == status)
-        
+
         # 검색 필터
         if search:
             search_pattern = f"%{search}%"
@@ -74,15 +149,39 @@ class StudentService:
                     Student.phone.ilike(search_pattern)
                 )
             )
-        
+
+        return query
+
+    def get_all(self, status: str = None, search: str = None, limit: int = None,
+                offset: int = None, with_guardians: bool = False,
+                course_id: int = None) -> List[Student]:
+        """모든 학생 조회 (limit/offset 페이지네이션 지원)
+
+        with_guardians=True면 guardians 관계를 selectinload로 함께 로딩한다
+        (학생 N명당 쿼리 2개 — 관계는 lazy="raise"라 명시적 적재가 필수).
+        """
+        query = self._filtered_query(status=status, search=search, course_id=course_id)
+
+        if with_guardians:
+            query = query.options(selectinload(Student.guardians))
+
         # 정렬
         query = query.order_by(Student.name)
-        
-        # 제한
+
+        # 페이지네이션
+        if offset:
+            query = query.offset(offset)
         if limit:
             query = query.limit(limit)
-        
+
         return query.all()
+
+    def count(self, status: str = None, search: str = None,
+              course_id: int = None) -> int:
+        """필터 조건에 맞는 학생 수 (페이지네이션 UI용)"""
+        return self._filtered_query(
+            status=status, search=search, course_id=course_id
+        ).with_entities(func.count(Student.id)).scalar() or 0
     
     def update(self, student_id: int, data: dict) -> Student:
         """학생 정보 수정"""
@@ -114,18 +213,23 @@ class StudentService:
             raise Exception(f"학생 정보 수정 실패: {str(e)}")
     
     def delete(self, student_id: int) -> bool:
-        """학생 삭제 (비활성화)"""
+        """학생 삭제 (비활성화)
+
+        전체 행 SELECT 후 ORM 객체를 수정하는 대신 UPDATE 한 문장으로
+        처리한다. rowcount로 존재 여부까지 확인되므로 사전 조회가 없다.
+        """
         try:
-            student = self.get_by_id(student_id)
-            if not student:
+            updated = self.db.query(Student).filter(Student.id == student_id).update(
+                {Student.status: StudentStatus.INACTIVE, Student.updated_at: datetime.utcnow()},
+                synchronize_session=False
+            )
+            if not updated:
                 raise Exception("학생을 찾을 수 없습니다.")
-            
-            student.status = StudentStatus.INACTIVE
-            student.updated_at = datetime.utcnow()
+
             self.db.commit()
-            
+
             return True
-            
+
         except Exception as e:
             self.db.rollback()
             raise Exception(f"학생 삭제 실패: {str(e)}")
@@ -184,11 +288,35 @@ class StudentService:
             StudentGuardian.guardian_id == guardian_id
         ).all()
     
+    def get_dashboard_counts(self) -> dict:
+        """대시보드 지표 집계 (총원/재학생/최근 30일 신규를 한 쿼리로)"""
+        cutoff = date.today() - timedelta(days=30)
+
+        total, active, recent = self.db.query(
+            func.count(Student.id),
+            func.sum(case((Student.status == StudentStatus.ACTIVE, 1), else_=0)),
+            func.sum(case((Student.enrollment_date >= cutoff, 1), else_=0))
+        ).one()
+
+        return {
+            'total_students': total or 0,
+            'active_students': int(active or 0),
+            'recent_students': int(recent or 0)
+        }
+
     def get_statistics(self) -> dict:
         """학생 통계"""
-        total_students = self.db.query(Student).count()
-        active_students = self.db.query(Student).filter(Student.status == StudentStatus.ACTIVE).count()
-        
+        # 전체/재학/최근 30일 신규를 SUM(CASE)로 묶어 한 번의 스캔으로 집계
+        # (COUNT 쿼리 3회 왕복 → 1회)
+        cutoff = date.today() - timedelta(days=30)
+        total_students, active_students, recent_students = self.db.query(
+            func.count(Student.id),
+            func.sum(case((Student.status == StudentStatus.ACTIVE, 1), else_=0)),
+            func.sum(case((Student.enrollment_date >= cutoff, 1), else_=0))
+        ).one()
+        active_students = int(active_students or 0)
+        recent_students = int(recent_students or 0)
+
         # 성별 통계
         gender_stats = self.db.query(
             Student.gender,
@@ -201,103 +329,170 @@ class StudentService:
             func.count(Student.id)
         ).filter(Student.grade.isnot(None)).group_by(Student.grade).all()
         
-        # 월별 신입생 통계 (최근 12개월)
+        # 월별 신입생 통계 (올해) — SQLite 전용 strftime 대신 DB 독립적인
+        # extract로 집계하고 'YYYY-MM' 키는 파이썬에서 조합.
+        # 날짜 범위 필터는 그대로 enrollment_date 인덱스를 탄다.
         monthly_enrollments = self.db.query(
-            func.strftime('%Y-%m', Student.enrollment_date).label('month'),
+            extract('year', Student.enrollment_date).label('y'),
+            extract('month', Student.enrollment_date).label('m'),
             func.count(Student.id)
         ).filter(
             Student.enrollment_date >= datetime.now().date().replace(month=1, day=1)
-        ).group_by('month').all()
+        ).group_by('y', 'm').all()
         
         return {
             'total_students': total_students,
             'active_students': active_students,
             'inactive_students': total_students - active_students,
-            'gender_distribution': {str(gender): count for gender, count in gender_stats},
+            'recent_students': recent_students or 0,
+            'gender_distribution': {(gender.value if gender else '미설정'): count for gender, count in gender_stats},
             'grade_distribution': {f"{grade}학년": count for grade, count in grade_stats if grade},
-            'monthly_enrollments': {month: count for month, count in monthly_enrollments}
+            'monthly_enrollments': {
+                f"{int(year):04d}-{int(month):02d}": count
+                for year, month, count in monthly_enrollments
+            }
         }
     
-    def generate_unique_academy_id(self) -> str:
-        """고유한 학원 등록번호 생성"""
-        while True:
-            academy_id = generate_academy_id()
-            existing = self.db.query(Student).filter(Student.academy_id == academy_id).first()
-            if not existing:
-                return academy_id
-    
-    def import_from_excel(self, file_path: str) -> dict:
-        """엑셀 파일에서 학생 데이터 가져오기"""
+    def import_from_excel(self, file_source) -> dict:
+        """엑셀 파일에서 학생 데이터 가져오기
+
+        file_source는 파일 경로 또는 BytesIO 같은 파일류 객체.
+        read_only 모드로 행 단위 스트리밍 파싱하므로 대량 업로드에도
+        전체 셀 그리드를 메모리에 올리지 않는다.
+        """
         try:
-            df = pd.read_excel(file_path)
-            
+            wb = openpyxl.load_workbook(file_source, read_only=True, data_only=True)
+            ws = wb.active
+            rows_iter = ws.iter_rows(values_only=True)
+
+            header = next(rows_iter, None)
+            if header is None:
+                return {'success_count': 0, 'error_count': 0, 'errors': []}
+
+            column_index = {name: i for i, name in enumerate(header) if name}
+
+            def cell(row, name, default=None):
+                idx = column_index.get(name)
+                if idx is None or idx >= len(row) or row[idx] is None:
+                    return default
+                return row[idx]
+
             success_count = 0
             error_count = 0
             errors = []
-            
-            for index, row in df.iterrows():
+
+            # 행별 ORM insert+commit 대신 500행 단위 bulk_insert_mappings로 적재.
+            # 등록번호 중복 검사는 행마다 쿼리하지 않고 기존 번호를 한 번만 읽어
+            # 메모리 집합으로 수행한다.
+            used_academy_ids = {row[0] for row in self.db.query(Student.academy_id).all()}
+
+            def next_academy_id():
+                while True:
+                    academy_id = generate_academy_id()
+                    if academy_id not in used_academy_ids:
+                        used_academy_ids.add(academy_id)
+                        return academy_id
+
+            chunk_size = 500
+            buffer = []
+
+            for index, row in enumerate(rows_iter):
                 try:
+                    birth_date = cell(row, '생년월일')
+                    if isinstance(birth_date, datetime):
+                        birth_date = birth_date.date()
+                    elif isinstance(birth_date, str):
+                        birth_date = datetime.strptime(birth_date, '%Y-%m-%d').date()
+
+                    grade = cell(row, '학년')
+
                     student_data = {
-                        'name': row.get('이름'),
-                        'gender': Gender.MALE if row.get('성별') == '남' else Gender.FEMALE,
-                        'birth_date': pd.to_datetime(row.get('생년월일')).date(),
-                        'phone': str(row.get('연락처', '')),
-                        'school_name': row.get('학교명'),
-                        'grade': int(row.get('학년', 0)) if pd.notna(row.get('학년')) else None,
-                        'postal_code': str(row.get('우편번호', '')),
-                        'road_address': row.get('주소'),
-                        'detail_address': row.get('상세주소'),
+                        'academy_id': next_academy_id(),
+                        'name': cell(row, '이름'),
+                        'gender': Gender.MALE if cell(row, '성별') == '남' else Gender.FEMALE,
+                        'birth_date': birth_date,
+                        'phone': str(cell(row, '연락처', '')),
+                        'school_name': cell(row, '학교명'),
+                        'grade': int(grade) if grade is not None else None,
+                        'postal_code': str(cell(row, '우편번호', '')),
+                        'road_address': cell(row, '주소'),
+                        'detail_address': cell(row, '상세주소'),
+                        'enrollment_date': date.today(),
                     }
-                    
+
                     # 필수 필드 검증
                     if not student_data['name']:
                         raise ValueError("이름은 필수입니다.")
-                    
-                    self.create(student_data)
+
+                    buffer.append(student_data)
                     success_count += 1
-                    
+
+                    if len(buffer) >= chunk_size:
+                        self.db.bulk_insert_mappings(Student, buffer)
+                        buffer.clear()
+
                 except Exception as e:
                     error_count += 1
                     errors.append(f"행 {index + 2}: {str(e)}")
-            
+
+            if buffer:
+                self.db.bulk_insert_mappings(Student, buffer)
+
+            self.db.commit()
+            wb.close()
+
             return {
                 'success_count': success_count,
                 'error_count': error_count,
                 'errors': errors
             }
-            
+
         except Exception as e:
+            self.db.rollback()
             raise Exception(f"엑셀 파일 처리 실패: {str(e)}")
     
     def export_to_excel(self, file_path: str, students: List[Student] = None) -> str:
-        """학생 데이터를 엑셀로 내보내기"""
+        """학생 데이터를 엑셀로 내보내기
+
+        ORM 객체를 행마다 딕셔너리로 풀지 않고 필요한 컬럼만 튜플로 조회해
+        DataFrame에 바로 싣고, 포맷 변환은 pandas 벡터 연산으로 처리한다.
+        """
         try:
-            if students is None:
-                students = self.get_all()
-            
-            data = []
-            for student in students:
-                data.append({
-                    '학원등록번호': student.academy_id,
-                    '이름': student.name,
-                    '성별': '남' if student.gender == Gender.MALE else '여',
-                    '생년월일': student.birth_date.strftime('%Y-%m-%d'),
-                    '연락처': student.phone or '',
-                    '이메일': student.email or '',
-                    '학교명': student.school_name or '',
-                    '학년': student.grade or '',
-                    '우편번호': student.postal_code or '',
-                    '주소': student.road_address or '',
-                    '상세주소': student.detail_address or '',
-                    '입학일': student.enrollment_date.strftime('%Y-%m-%d'),
-                    '상태': student.status.value,
-                    '등록일': student.created_at.strftime('%Y-%m-%d %H:%M')
-                })
-            
-            df = pd.DataFrame(data)
-            df.to_excel(file_path, index=False, engine='openpyxl')
-            
+            query = self.db.query(
+                Student.academy_id, Student.name, Student.gender,
+                Student.birth_date, Student.phone, Student.email,
+                Student.school_name, Student.grade, Student.postal_code,
+                Student.road_address, Student.detail_address,
+                Student.enrollment_date, Student.status, Student.created_at
+            ).order_by(Student.name)
+            if students is not None:
+                query = query.filter(Student.id.in_([s.id for s in students]))
+
+            df = pd.DataFrame.from_records(query.all(), columns=[
+                '학원등록번호', '이름', '성별', '생년월일', '연락처', '이메일',
+                '학교명', '학년', '우편번호', '주소', '상세주소',
+                '입학일', '상태', '등록일'
+            ])
+
+            if not df.empty:
+                df['성별'] = df['성별'].map({g: g.value for g in Gender})
+                df['상태'] = df['상태'].map({s: s.value for s in StudentStatus})
+                df['생년월일'] = pd.to_datetime(df['생년월일']).dt.strftime('%Y-%m-%d')
+                df['입학일'] = pd.to_datetime(df['입학일']).dt.strftime('%Y-%m-%d')
+                df['등록일'] = pd.to_datetime(df['등록일']).dt.strftime('%Y-%m-%d %H:%M')
+                df['학년'] = df['학년'].astype('Int64')
+                text_columns = ['연락처', '이메일', '학교명', '학년', '우편번호', '주소', '상세주소']
+                df[text_columns] = df[text_columns].astype(object).where(
+                    df[text_columns].notna(), ''
+                )
+
+            # xlsxwriter가 openpyxl보다 쓰기 전용 워크북 생성이 빠르다.
+            # (constant_memory 모드는 행 순서 쓰기를 강제하는데 to_excel은
+            # 컬럼 단위로 쓰므로 함께 쓰면 셀이 유실된다 — 사용 금지)
+            with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
+                df.to_excel(writer, index=False)
+
             return file_path
-            
+
         except Exception as e:
             raise Exception(f"엑셀 내보내기 실패: {str(e)}")
\ No newline at end of file
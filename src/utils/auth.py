@@ -1,8 +1,15 @@
+import time
+from datetime import datetime
+
 import streamlit as st
 from src.services.database import get_db_session
 from src.models.database import User
 from src.utils.security import verify_password, generate_access_token, verify_token
 
+# 토큰 재검증 주기 — rerun마다 JWT를 다시 디코드하지 않고
+# 이 주기가 지났을 때만 서명/만료를 다시 확인한다
+_TOKEN_REVERIFY_SECONDS = 60
+
 def login(username: str, password: str) -> bool:
     """로그인 처리"""
     db = get_db_session()
@@ -28,9 +35,9 @@ def login(username: str, password: str) -> bool:
             token_data = {"user_id": user.id, "username": user.username}
             access_token = generate_access_token(token_data)
             st.session_state.access_token = access_token
+            st.session_state._token_verified_at = time.time()
             
             # 마지막 로그인 시간 업데이트
-            from datetime import datetime
             user.last_login = datetime.utcnow()
             db.commit()
             
@@ -52,14 +59,34 @@ def logout():
         del st.session_state.user
     if 'access_token' in st.session_state:
         del st.session_state.access_token
+    if '_token_verified_at' in st.session_state:
+        del st.session_state._token_verified_at
 
 def check_authentication() -> bool:
-    """인증 상태 확인"""
+    """인증 상태 확인
+
+    토큰 검증 결과는 _TOKEN_REVERIFY_SECONDS 동안 캐시되므로
+    위젯 상호작용마다 일어나는 rerun에서는 디코드 비용이 들지 않는다.
+    """
     if 'authenticated' not in st.session_state:
         show_login_form()
         return False
-    
-    return st.session_state.authenticated
+
+    if not st.session_state.authenticated:
+        return False
+
+    # 주기적으로만 JWT를 재검증 (만료/서명 오류 시 즉시 로그아웃)
+    token = st.session_state.get('access_token')
+    if token:
+        verified_at = st.session_state.get('_token_verified_at', 0.0)
+        if time.time() - verified_at > _TOKEN_REVERIFY_SECONDS:
+            if verify_token(token) is None:
+                logout()
+                show_login_form()
+                return False
+            st.session_state._token_verified_at = time.time()
+
+    return True
 
 def show_login_form():
     """로그인 폼 표시"""
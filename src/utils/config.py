@@ -1,56 +1,106 @@
 import os
-from pathlib import Path
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
+# 환경변수는 프로세스 시작 후 바뀌지 않으므로 설정은 한 번만 구성한다.
+# frozen 데이터클래스라 호출자 쪽에서 변형될 수 없고, 속성 접근이
+# 딕셔너리 키 조회보다 빠르다.
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """애플리케이션 설정 (불변 싱글톤)"""
+    app_name: str
+    app_version: str
+    debug: bool
+    timezone: str
+    secret_key: str
+    jwt_secret: str
+    bcrypt_rounds: int
+    upload_folder: str
+    max_file_size: int
+
+@lru_cache(maxsize=1)
 def load_config():
-    """설정 로드"""
-    return {
-        "app_name": os.getenv("APP_NAME", "학원 관리 시스템"),
-        "app_version": os.getenv("APP_VERSION", "1.0.0"),
-        "debug": os.getenv("DEBUG", "True").lower() == "true",
-        "timezone": os.getenv("TIMEZONE", "Asia/Seoul"),
-        "secret_key": os.getenv("SECRET_KEY", "your-secret-key-here"),
-        "jwt_secret": os.getenv("JWT_SECRET_KEY", "your-jwt-secret-here"),
-        "bcrypt_rounds": int(os.getenv("BCRYPT_ROUNDS", "12")),
-        "upload_folder": os.getenv("UPLOAD_FOLDER", "uploads"),
-        "max_file_size": int(os.getenv("MAX_FILE_SIZE", "5242880")),
-    }
+    """설정 로드 (프로세스당 1회 구성, 읽기 전용)"""
+    return Config(
+        app_name=os.environ.get("APP_NAME", "학원 관리 시스템"),
+        app_version=os.environ.get("APP_VERSION", "1.0.0"),
+        debug=os.environ.get("DEBUG", "True").lower() == "true",
+        timezone=os.environ.get("TIMEZONE", "Asia/Seoul"),
+        secret_key=os.environ.get("SECRET_KEY", "your-secret-key-here"),
+        jwt_secret=os.environ.get("JWT_SECRET_KEY", "your-jwt-secret-here"),
+        bcrypt_rounds=int(os.environ.get("BCRYPT_ROUNDS", "12")),
+        upload_folder=os.environ.get("UPLOAD_FOLDER", "uploads"),
+        max_file_size=int(os.environ.get("MAX_FILE_SIZE", "5242880")),
+    )
 
+@lru_cache(maxsize=1)
 def get_database_url():
     """데이터베이스 URL 가져오기"""
-    return os.getenv("DATABASE_URL", "sqlite:///database/academy.db")
+    return os.environ.get("DATABASE_URL", "sqlite:///database/academy.db")
 
+@lru_cache(maxsize=1)
 def get_email_config():
     """이메일 설정 가져오기"""
-    return {
-        "smtp_server": os.getenv("SMTP_SERVER", "smtp.gmail.com"),
-        "smtp_port": int(os.getenv("SMTP_PORT", "587")),
-        "email_user": os.getenv("EMAIL_USER"),
-        "email_password": os.getenv("EMAIL_PASSWORD"),
-    }
+    return MappingProxyType({
+        "smtp_server": os.environ.get("SMTP_SERVER", "smtp.gmail.com"),
+        "smtp_port": int(os.environ.get("SMTP_PORT", "587")),
+        "email_user": os.environ.get("EMAIL_USER"),
+        "email_password": os.environ.get("EMAIL_PASSWORD"),
+    })
 
+@lru_cache(maxsize=1)
 def get_sms_config():
     """SMS 설정 가져오기"""
-    return {
-        "twilio_account_sid": os.getenv("TWILIO_ACCOUNT_SID"),
-        "twilio_auth_token": os.getenv("TWILIO_AUTH_TOKEN"),
-        "twilio_phone_number": os.getenv("TWILIO_PHONE_NUMBER"),
-    }
+    return MappingProxyType({
+        "twilio_account_sid": os.environ.get("TWILIO_ACCOUNT_SID"),
+        "twilio_auth_token": os.environ.get("TWILIO_AUTH_TOKEN"),
+        "twilio_phone_number": os.environ.get("TWILIO_PHONE_NUMBER"),
+    })
 
+@lru_cache(maxsize=1)
 def get_kakao_config():
     """카카오톡 설정 가져오기"""
-    return {
-        "api_key": os.getenv("KAKAO_API_KEY"),
-        "sender_key": os.getenv("KAKAO_SENDER_KEY"),
-    }
+    return MappingProxyType({
+        "api_key": os.environ.get("KAKAO_API_KEY"),
+        "sender_key": os.environ.get("KAKAO_SENDER_KEY"),
+    })
+
+def validate_config():
+    """환경변수 형식 검증 및 설정 캐시 예열
+
+    숫자여야 하는 환경변수가 잘못돼 있으면 첫 사용 시점이 아니라
+    기동 시점에 바로 실패하도록 한다. 통과하면 설정 캐시를 미리
+    채워 요청 경로에서 구성 비용이 들지 않는다.
+    """
+    for name in ("BCRYPT_ROUNDS", "MAX_FILE_SIZE", "SMTP_PORT"):
+        value = os.environ.get(name)
+        if value is not None:
+            try:
+                int(value)
+            except ValueError:
+                raise ValueError(f"환경변수 {name} 값이 정수가 아닙니다: {value!r}")
+
+    load_config()
+    get_database_url()
+    get_email_config()
+    get_sms_config()
+    get_kakao_config()
+
+# 임포트 시점에 검증 — 잘못된 설정으로 서비스가 떠 있는 상태를 막는다
+validate_config()
 
 def ensure_upload_directory():
-    """업로드 디렉토리 확인 및 생성"""
-    upload_folder = load_config()["upload_folder"]
-    Path(upload_folder).mkdir(parents=True, exist_ok=True)
-    Path(f"{upload_folder}/profiles").mkdir(parents=True, exist_ok=True)
-    Path(f"{upload_folder}/documents").mkdir(parents=True, exist_ok=True)
-    Path(f"{upload_folder}/temp").mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+    """업로드 디렉토리 확인 및 생성
+
+    하위 디렉토리를 parents=True로 만들면 상위 폴더도 같이 생기므로
+    업로드 루트를 따로 만들 필요가 없다.
+    """
+    base = load_config().upload_folder
+    for sub in ("profiles", "documents", "temp"):
+        os.makedirs(os.path.join(base, sub), exist_ok=True)
\ No newline at end of file
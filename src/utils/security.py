@@ -1,48 +1,161 @@
+import base64
 import bcrypt
-import secrets
-from datetime import datetime, timedelta
-from jose import JWTError, jwt
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
 from src.utils.config import load_config
 
 config = load_config()
 
+# 보정된 bcrypt 라운드 수 (첫 해시 때 calibrate_bcrypt_rounds가 채움)
+_calibrated_rounds = None
+
+def calibrate_bcrypt_rounds(target_ms: int = 250) -> int:
+    """해시 1회가 target_ms 이상 걸리는 최소 라운드 수를 실측해 적용
+
+    같은 라운드 수라도 하드웨어에 따라 비용이 수 배 차이 나므로,
+    고정값 대신 8라운드부터 올려 가며 측정해 로그인 지연을 배포
+    환경과 무관하게 예측 가능한 수준으로 맞춘다. 환경변수
+    BCRYPT_ROUNDS가 명시돼 있으면 측정 없이 그 값을 쓴다.
+    """
+    global _calibrated_rounds
+
+    if os.getenv("BCRYPT_ROUNDS"):
+        _calibrated_rounds = config.bcrypt_rounds
+        return _calibrated_rounds
+
+    sample = b"calibration-sample-password"
+    for rounds in range(8, 15):
+        start = time.perf_counter()
+        bcrypt.hashpw(sample, bcrypt.gensalt(rounds=rounds))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= target_ms:
+            break
+
+    _calibrated_rounds = rounds
+    return _calibrated_rounds
+
+def _bcrypt_rounds() -> int:
+    """현재 적용할 라운드 수 (필요 시 1회 보정)"""
+    if _calibrated_rounds is None:
+        calibrate_bcrypt_rounds()
+    return _calibrated_rounds
+
 def hash_password(password: str) -> str:
     """비밀번호 해시화"""
-    salt = bcrypt.gensalt(rounds=config["bcrypt_rounds"])
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    salt = bcrypt.gensalt(rounds=_bcrypt_rounds())
+    # bcrypt 해시는 항상 ASCII — UTF-8 검증 루프 없는 ascii 디코드 사용
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('ascii')
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('ascii'))
+
+# JWT(HS256) 직접 구현 — python-jose는 서명 경로가 순수 파이썬이라 느려서
+# OpenSSL 기반 hashlib/hmac로 인코딩/검증한다. 헤더는 항상 같으므로
+# 미리 인코딩해 두고, 시크릿도 바이트로 한 번만 변환한다.
+_JWT_HEADER_B64 = b'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9'  # {"alg":"HS256","typ":"JWT"}
+_JWT_SECRET = config.jwt_secret.encode("utf-8")
+
+def _b64url_encode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b'=')
+
+def _b64url_decode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64decode(raw + b'=' * (-len(raw) % 4))
 
 def generate_access_token(data: dict, expires_delta: timedelta = None):
     """액세스 토큰 생성"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=7)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, config["jwt_secret"], algorithm="HS256")
-    return encoded_jwt
+    expires_seconds = expires_delta.total_seconds() if expires_delta else 604800  # 7일
+    to_encode["exp"] = int(time.time() + expires_seconds)
+
+    payload_b64 = _b64url_encode(json.dumps(to_encode, separators=(',', ':')).encode('utf-8'))
+    signing_input = _JWT_HEADER_B64 + b'.' + payload_b64
+    signature = hmac.new(_JWT_SECRET, signing_input, hashlib.sha256).digest()
+    return (signing_input + b'.' + _b64url_encode(signature)).decode('ascii')
+
+def _decode_token(token: str):
+    """HS256 토큰 서명/만료 검증 후 payload 반환 (실패 시 None)"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.encode('ascii').split(b'.')
+    except (ValueError, UnicodeEncodeError):
+        return None
+
+    # 우리가 발급한 고정 헤더만 수용 — 알고리즘 혼동(none 등) 원천 차단
+    if not hmac.compare_digest(header_b64, _JWT_HEADER_B64):
+        return None
+
+    expected = hmac.new(_JWT_SECRET, header_b64 + b'.' + payload_b64, hashlib.sha256).digest()
+    if not hmac.compare_digest(_b64url_encode(expected), signature_b64):
+        return None
 
-def verify_token(token: str):
-    """토큰 검증"""
     try:
-        payload = jwt.decode(token, config["jwt_secret"], algorithms=["HS256"])
-        return payload
-    except JWTError:
+        payload = json.loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError):
+        return None
+
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        return None
+
+    return payload
+
+# 검증 결과 단기 캐시 — 같은 토큰이 짧은 간격으로 반복 검증될 때
+# HMAC/base64/JSON 디코드를 건너뛴다. TTL이 짧아 토큰 폐기 지연도 5초 이내.
+# (cachetools 의존성 없이 락으로 보호되는 딕셔너리로 충분)
+_TOKEN_CACHE_TTL = 5
+_TOKEN_CACHE_MAX = 10000
+_token_cache = {}  # token -> (만료 시각 monotonic, payload)
+_token_cache_lock = threading.Lock()
+
+def verify_token(token: str):
+    """토큰 검증 (결과는 최대 5초 캐시)"""
+    now = time.monotonic()
+    with _token_cache_lock:
+        hit = _token_cache.get(token)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+
+    payload = _decode_token(token)
+    if payload is None:
         return None
 
+    # 토큰 자체 만료(exp)가 TTL보다 먼저 오면 그 시점까지만 캐시
+    cache_ttl = _TOKEN_CACHE_TTL
+    exp = payload.get("exp")
+    if exp is not None:
+        cache_ttl = min(cache_ttl, exp - time.time())
+
+    if cache_ttl > 0:
+        with _token_cache_lock:
+            if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                _token_cache.clear()
+            _token_cache[token] = (now + cache_ttl, payload)
+
+    return payload
+
+def _token_hex(nbytes: int) -> str:
+    """secrets.token_hex와 같은 CSPRNG 난수를 래퍼 체인 없이 생성"""
+    return os.urandom(nbytes).hex()
+
+# 등록번호의 날짜 접두어는 하루 동안 같으므로 strftime 결과를 캐시
+_cached_date = (None, "")  # (date, "%y%m%d" 문자열)
+
 def generate_academy_id() -> str:
     """학원 등록번호 생성"""
-    timestamp = datetime.now().strftime("%y%m%d")
-    random_suffix = secrets.token_hex(2).upper()
-    return f"AC{timestamp}{random_suffix}"
+    global _cached_date
+    today = date.today()
+    if today != _cached_date[0]:
+        _cached_date = (today, today.strftime("%y%m%d"))
+    random_suffix = _token_hex(2).upper()
+    return f"AC{_cached_date[1]}{random_suffix}"
 
 def generate_secure_filename(filename: str) -> str:
     """보안 파일명 생성"""
-    file_extension = filename.split('.')[-1] if '.' in filename else ''
-    secure_name = secrets.token_hex(16)
-    return f"{secure_name}.{file_extension}" if file_extension else secure_name
\ No newline at end of file
+    dot = filename.rfind('.')
+    extension = filename[dot:] if dot >= 0 else ''
+    return _token_hex(16) + extension
\ No newline at end of file